@@ -24,3 +24,4 @@ class CUBAExt(IntEnum):
     STRESS_MODEL = 14
     EXTERNAL_BODY_FORCE_MODEL = 15
     EXTERNAL_BODY_FORCE_MODEL_COEFFS = 16
+    DEBUG_CODE_FILE = 17
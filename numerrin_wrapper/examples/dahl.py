@@ -64,14 +64,9 @@ wrapper.add_dataset(mesh)
 
 mesh_inside_wrapper = wrapper.get_dataset(name)
 
-updated_points = []
-for point in mesh_inside_wrapper.iter(item_type=CUBA.POINT):
-    point.data[CUBA.VOLUME_FRACTION] = 0.001
-    point.data[CUBA.PRESSURE] = 0.0
-    point.data[CUBA.VELOCITY] = [0.0191, 0.0, 0.0]
-    updated_points.append(point)
-
-mesh_inside_wrapper.update(updated_points)
+mesh_inside_wrapper.set_field(CUBA.VOLUME_FRACTION, 0.001)
+mesh_inside_wrapper.set_field(CUBA.PRESSURE, 0.0)
+mesh_inside_wrapper.set_field(CUBA.VELOCITY, [0.0191, 0.0, 0.0])
 
 wrapper.run()
 print "Run up to time: ", mesh_inside_wrapper._time
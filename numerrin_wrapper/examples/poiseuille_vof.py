@@ -8,6 +8,8 @@ from simphony.engine import numerrin
 
 from mayavi.scripts import mayavi2
 
+import numpy
+
 wrapper = numerrin.Wrapper()
 CUBAExt = numerrin.CUBAExt
 
@@ -55,20 +57,11 @@ mesh_inside_wrapper = wrapper.get_dataset(name)
 
 # initial state. In VOF only one velocity and pressure field
 
-updated_points = []
-for point in mesh_inside_wrapper.iter(item_type=CUBA.POINT):
-    x = point.coordinates[0]
-    if x < 0.02/3.0:
-        point.data[CUBA.VOLUME_FRACTION] = 1.0
-    else:
-        point.data[CUBA.VOLUME_FRACTION] = 0.0
-
-    point.data[CUBA.PRESSURE] = 0.0
-    point.data[CUBA.VELOCITY] = [0.0, 0.0, 0.0]
-
-    updated_points.append(point)
-
-mesh_inside_wrapper.update(updated_points)
+x = mesh_inside_wrapper.get_coordinates()[:, 0]
+mesh_inside_wrapper.set_field(CUBA.VOLUME_FRACTION,
+                              numpy.where(x < 0.02/3.0, 1.0, 0.0))
+mesh_inside_wrapper.set_field(CUBA.PRESSURE, 0.0)
+mesh_inside_wrapper.set_field(CUBA.VELOCITY, [0.0, 0.0, 0.0])
 
 wrapper.run()
 print "Run up to time: ", mesh_inside_wrapper._time
@@ -31,7 +31,10 @@ def create_quad_mesh(name, numerrin_wrapper, corner_points, extrude_length,
 
     boundary_names = ['inflow', 'outflow', 'walls', 'frontAndBack']
 
-    p_name = name + "Mesh"
+    if name in numerrin_wrapper.get_dataset_names():
+        raise ValueError('Mesh \'{}\' already exists'.format(name))
+
+    # mesh and boundary domains are created with their final names
     mesh_code = """
 pts={%f,%f;%f,%f;%f,%f;%f,%f}
 Quadmesh(pts,{%i,%i},{0,0,0,0},{1.0,1.0,-1.0,-1.0},mesh2d,domains2d)
@@ -47,26 +50,13 @@ omega->domains[0]
        corner_points[1][0], corner_points[1][1],
        corner_points[2][0], corner_points[2][1],
        corner_points[3][0], corner_points[3][1],
-       nex, ney, extrude_length, nez, p_name, p_name+boundary_names[0],
-       p_name+boundary_names[1],  p_name+boundary_names[2],
-       p_name+boundary_names[3])
+       nex, ney, extrude_length, nez, name, name+boundary_names[0],
+       name+boundary_names[1],  name+boundary_names[2],
+       name+boundary_names[3])
     code = NumerrinCode(numerrin_wrapper.pool.ph)
     code.parse_string(mesh_code)
     code.execute(1)
-    (smesh, mmap, boundaries) =\
-        numerrin_wrapper.pool.export_mesh(name, p_name,
-                                          boundary_names)
+    numerrin_wrapper.pool.invalidate_metadata()
 
     # add mesh to wrapper
-    numerrin_wrapper.add_dataset(smesh)
-
-    # add boundaries
-    uidmap = numerrin_wrapper.get_dataset(name)._uuidToNumLabel
-    boundary_faces = {}
-    for boundary in boundaries:
-        boundary_faces[boundary] = []
-        for fuid in boundaries[boundary]:
-            boundary_faces[boundary].append(uidmap[fuid])
-    numerrin_wrapper.get_dataset(name).pool.add_boundaries(name, boundaries,
-                                                           boundary_faces)
-    numerrin_wrapper.get_dataset(name)._boundaries = boundaries
+    numerrin_wrapper.add_dataset_from_pool(name, boundary_names)
@@ -4,7 +4,9 @@ from .cuba_extension import CUBAExt
 
 from .numerrin_templates import (solverFrames, functions, associations,
                                  functionSpaces, get_numerrin_solver,
-                                 timeLoop, numname, to_numerrin_expression,
+                                 timeLoop, numname, bc_variable_name,
+                                 boundary_groups, condition_value,
+                                 union_code,
                                  multiphase_solvers, external_body_force_model,
                                  mixture_model, relative_velocity_code,
                                  check_boundary_names,
@@ -12,6 +14,7 @@ from .numerrin_templates import (solverFrames, functions, associations,
                                  zero_normal_velocity_types,
                                  solver_variables, solver_variable_names,
                                  solver_space_names, variable_dimension)
+from .numerrin_ir import optimize_code
 import numerrin
 
 
@@ -23,6 +26,10 @@ class NumerrinCode(object):
     def __init__(self, ph):
         self.ph = ph
         self.ch = numerrin.createcode()
+        # generated code by configuration fingerprint
+        self._generated = {}
+        # fingerprint of generated code in code handle
+        self._parsed_key = None
 
     def __del__(self):
         numerrin.deletecode(self.ch)
@@ -48,6 +55,7 @@ class NumerrinCode(object):
 
         """
         numerrin.parsestring(self.ph, self.ch, codeString)
+        self._parsed_key = None
 
     def execute(self, nproc):
         """ execute Numerrin code
@@ -65,6 +73,120 @@ class NumerrinCode(object):
 
         """
         numerrin.clearcode(self.ch)
+        self._parsed_key = None
+
+    def generate_cached_code(self, CM, SP, SPExt, BC, CMExt, mesh,
+                             init=False, copy_back=True):
+        """ generate Numerrin code or return it from cache
+
+        Code is generated again only if the settings affecting code
+        generation or the mesh boundaries have changed.
+
+        Parameters
+        ----------
+        CM : DataContainer
+            Computational Method
+        SP : DataContainer
+            System Parameters
+        SPExt : dictionary
+            extension to SP
+        BC : DataContainer
+            Boundary Conditions
+        CMExt : dictionary
+            extension to CM
+        mesh : Numerrin mesh
+        init : bool, optional
+            if True, initialization code is included
+        copy_back : bool, optional
+            if False, the code copying solver variables to point
+            variables is left out
+
+        Return
+        ------
+        code : str
+            Numerrin code as a string
+
+        """
+
+        key = _fingerprint(CM, SPExt, BC, CMExt, mesh, init, copy_back)
+        if key not in self._generated:
+            code = ""
+            if init:
+                code += self.generate_init_code(CM, SP, SPExt, BC, CMExt)
+            code += self.generate_step_code(CM, SP, SPExt, BC, CMExt, mesh)
+            if copy_back:
+                code += self.generate_copy_back_code(CM, CMExt)
+            # only the latest configuration is kept
+            self._generated = {key: code}
+        return self._generated[key]
+
+    def generate_bc_values(self, CM, BC):
+        """ generate values of fixed value boundary conditions
+
+        The generated code reads the boundary condition values from
+        pool variables, which have to be put to pool before execution.
+
+        Parameters
+        ----------
+        CM : DataContainer
+            Computational Method
+        BC : DataContainer
+            Boundary Conditions
+
+        Return
+        ------
+        values : dictionary
+            map from pool variable name to boundary condition value
+
+        """
+
+        name = CM[CUBA.NAME]
+        values = {}
+        for cuba in (CUBA.VELOCITY, CUBA.PRESSURE, CUBA.VOLUME_FRACTION):
+            if cuba not in BC:
+                continue
+            for domain, condition, members in boundary_groups(
+                    BC[cuba], name, numname[cuba]):
+                if condition not in non_fixed_boundary_types:
+                    values[bc_variable_name(domain, cuba)] =\
+                        condition_value(condition)
+        return values
+
+    def parse_cached_code(self, CM, SP, SPExt, BC, CMExt, mesh,
+                          init=False, copy_back=True, code_file=None):
+        """ parse generated Numerrin code unless already parsed
+
+        The code handle is cleared and the code parsed only if the
+        generated code differs from the code parsed last time.
+
+        Parameters
+        ----------
+        See generate_cached_code
+
+        code_file : str, optional
+            if given, the code is written to this file on every call,
+            also when the code parsed last time is used
+
+        Return
+        ------
+        parsed : bool
+            True if code was parsed
+
+        """
+
+        key = _fingerprint(CM, SPExt, BC, CMExt, mesh, init, copy_back)
+        if code_file is not None:
+            with open(code_file, 'w') as f:
+                f.write(self.generate_cached_code(CM, SP, SPExt, BC, CMExt,
+                                                  mesh, init, copy_back))
+        if key == self._parsed_key:
+            return False
+        code = self.generate_cached_code(CM, SP, SPExt, BC, CMExt, mesh,
+                                         init, copy_back)
+        self.clear()
+        self.parse_string(code)
+        self._parsed_key = key
+        return True
 
     def generate_init_code(self, CM, SP, SPExt, BC, CMExt):
         """ generate Numerrin code for function domain and space definitions
@@ -98,26 +220,59 @@ class NumerrinCode(object):
         pressureBCs = BC[CUBA.PRESSURE]
         velocityBCs = BC[CUBA.VELOCITY]
 
-        boundaries = []
-        extra_functions = ""
-        for boundary in pressureBCs:
-            if boundary not in boundaries:
-                boundaries.append(boundary)
-        for boundary in velocityBCs:
-            if boundary not in boundaries:
-                boundaries.append(boundary)
-            if velocityBCs[boundary] in zero_normal_velocity_types:
-                extra_functions += "Z" + boundary +\
-                    "=Space(" + boundary + ",\"Split\",2)\n"
-                for b in velocityBCs:
-                    if b != boundary:
-                        extra_functions += "Eliminate(Z" + boundary + "," +\
-                            b + ")\n"
-                extra_functions += "lambda" + boundary + " in Z" +\
-                    boundary + "\n"
+        boundaries = sorted(set(pressureBCs) | set(velocityBCs))
         for boundary in boundaries:
             domaincode += boundary + "->" + name + boundary + "\n"
 
+        # zero normal velocity boundaries, the Lagrange multiplier space
+        # of a group is eliminated on the other velocity boundaries
+        # (unions of preceding and following boundaries), the order
+        # depends only on the zero normal velocity groups and not on the
+        # values of the other boundaries
+        velocity_groups = [group for group in
+                           boundary_groups(velocityBCs, name,
+                                           numname[CUBA.VELOCITY])
+                           if group[1] in zero_normal_velocity_types]
+        order = sorted(boundary for boundary in velocityBCs
+                       if velocityBCs[boundary] not in
+                       zero_normal_velocity_types)
+        start = len(order)
+        slip_groups = []
+        for domain, condition, members in velocity_groups:
+            slip_groups.append((domain, members, start,
+                                start + len(members)))
+            order += members
+            start += len(members)
+        mesh_domains = [name + boundary for boundary in order]
+        extra_functions = ""
+        prefixes = []
+        suffixes = []
+        if slip_groups:
+            last_start = max(group[2] for group in slip_groups)
+            first_end = min(group[3] for group in slip_groups)
+            if last_start > 0:
+                union, prefixes = union_code(name + "VelocityPrefix",
+                                             mesh_domains[:last_start])
+                domaincode += union
+            if first_end < len(order):
+                union, suffixes = union_code(name + "VelocitySuffix",
+                                             mesh_domains[first_end:][::-1])
+                domaincode += union
+        for domain, members, first, last in slip_groups:
+            if len(members) > 1:
+                domaincode += union_code(
+                    domain, [name + member for member in members])[0]
+            extra_functions += "Z" + domain +\
+                "=Space(" + domain + ",\"Split\",2)\n"
+            if first > 0:
+                extra_functions += "Eliminate(Z" + domain + "," +\
+                    prefixes[first - 1] + ")\n"
+            if last < len(order):
+                extra_functions += "Eliminate(Z" + domain + "," +\
+                    suffixes[len(order) - last - 1] + ")\n"
+            extra_functions += "lambda" + domain + " in Z" +\
+                domain + "\n"
+
         # functions
         code += functions[solver]
         # domains
@@ -133,11 +288,10 @@ class NumerrinCode(object):
         else:
             i = 3
         extra_associations = ""
-        for boundary in velocityBCs:
-            if velocityBCs[boundary] in zero_normal_velocity_types:
-                i += 1
-                extra_associations += "q[" + str(i) + "]->lambda" +\
-                    boundary + "\n"
+        for domain, members, first, last in slip_groups:
+            i += 1
+            extra_associations += "q[" + str(i) + "]->lambda" +\
+                domain + "\n"
 
         if solver in multiphase_solvers:
             code += associations[solver].format(
@@ -175,6 +329,36 @@ class NumerrinCode(object):
     def generate_code(self, CM, SP, SPExt, BC, CMExt, mesh):
         """ generate Numerrin code according to user settings
 
+        The code consists of the time stepping code followed by
+        the code copying solver variables to point variables.
+
+        Parameters
+        ----------
+        CM : DataContainer
+            Computational Method
+        SP : DataContainer
+            System Parameters
+        SPExt : dictionary
+            extension to SP
+        BC : DataContainer
+            Boundary Conditions
+        CMExt : dictionary
+            extension to CM
+        mesh : Numerrin mesh
+
+        Return
+        ------
+        code : str
+            Numerrin code as a string
+
+        """
+
+        return self.generate_step_code(CM, SP, SPExt, BC, CMExt, mesh) +\
+            self.generate_copy_back_code(CM, CMExt)
+
+    def generate_step_code(self, CM, SP, SPExt, BC, CMExt, mesh):
+        """ generate Numerrin code for NumberOfTimeSteps time steps
+
         Parameters
         ----------
         CM : DataContainer
@@ -200,7 +384,8 @@ class NumerrinCode(object):
         solver = get_numerrin_solver(CMExt)
         code = ""
 
-        # define boundary conditions
+        # define boundary conditions, boundaries with equal conditions
+        # are grouped to union domains
         bccode = ""
         pressureBCs = BC[CUBA.PRESSURE]
         check_boundary_names(pressureBCs, mesh._boundaries.keys(),
@@ -209,92 +394,93 @@ class NumerrinCode(object):
         check_boundary_names(velocityBCs, mesh._boundaries.keys(),
                              CUBA.VELOCITY)
 
-        boundaries = []
+        pressure_groups = boundary_groups(pressureBCs, name,
+                                          numname[CUBA.PRESSURE])
+        velocity_groups = boundary_groups(velocityBCs, name,
+                                          numname[CUBA.VELOCITY])
+        slip_groups = [group for group in velocity_groups
+                       if group[1] in zero_normal_velocity_types]
+        fixed_pressure_groups = [group for group in pressure_groups
+                                 if group[1] not in
+                                 non_fixed_boundary_types]
+        fixed_velocity_groups = [group for group in velocity_groups
+                                 if group[1] not in
+                                 non_fixed_boundary_types]
+        groups = fixed_pressure_groups + fixed_velocity_groups
+        boundaries = set(pressureBCs) | set(velocityBCs)
+
+        velocity_code = ""
+        for domain, condition, members in fixed_velocity_groups:
+            velo = bc_variable_name(domain, CUBA.VELOCITY)
+            velocity_code += "Constraint(" + domain + ",V)\n"
+            velocity_code += " up=u(.)\n"
+            velocity_code += " r[0] <- up[0] - " + velo + "[0]\n"
+            velocity_code += " r[1] <- up[1] - " + velo + "[1]\n"
+            velocity_code += " r[2] <- up[2] - " + velo + "[2]\n"
+            velocity_code += "EndConstraint\n"
 
         if solver == "timeDependentLaminar":
-            for boundary in pressureBCs:
-                if boundary not in boundaries:
-                    boundaries.append(boundary)
-                if pressureBCs[boundary] not in non_fixed_boundary_types:
-                    # integrate momentum on outflow boundaries
-                    # (where pressure is fixed)
-                    bccode += "Integral(" + boundary + ",\"VlFlx2\",1)\n"
-                    bccode += "nor:=NormalVector\n"
-                    bccode += "vf:=VolumeFunction\n"
-                    bccode += "If u(.) dot nor > 0.0\n"
-                    bccode += "r[0] <- Density*u[0](.)*u(.) dot nor*vf\n"
-                    bccode += "r[1] <- Density*u[1](.)*u(.) dot nor*vf\n"
-                    bccode += "r[2] <- Density*u[2](.)*u(.) dot nor*vf\n"
-                    bccode += "EndIf\n"
-                    bccode += "EndIntegral\n"
-            for boundary in velocityBCs:
-                if boundary not in boundaries:
-                    boundaries.append(boundary)
-                if velocityBCs[boundary] not in non_fixed_boundary_types:
-                    velo = to_numerrin_expression(velocityBCs[boundary][1])
-                    bccode += "Constraint(" + boundary + ",V)\n"
-                    bccode += " up=u(.)\n"
-                    bccode += " r[0] <- up[0] - " + velo[0] + "\n"
-                    bccode += " r[1] <- up[1] - " + velo[1] + "\n"
-                    bccode += " r[2] <- up[2] - " + velo[2] + "\n"
-                    bccode += "EndConstraint\n"
+            for domain, condition, members in fixed_pressure_groups:
+                # integrate momentum on outflow boundaries
+                # (where pressure is fixed)
+                bccode += "Integral(" + domain + ",\"VlFlx2\",1)\n"
+                bccode += "nor:=NormalVector\n"
+                bccode += "vf:=VolumeFunction\n"
+                bccode += "If u(.) dot nor > 0.0\n"
+                bccode += "r[0] <- Density*u[0](.)*u(.) dot nor*vf\n"
+                bccode += "r[1] <- Density*u[1](.)*u(.) dot nor*vf\n"
+                bccode += "r[2] <- Density*u[2](.)*u(.) dot nor*vf\n"
+                bccode += "EndIf\n"
+                bccode += "EndIntegral\n"
 
         elif solver in multiphase_solvers:
-            for boundary in pressureBCs:
-                if boundary not in boundaries:
-                    boundaries.append(boundary)
-                if pressureBCs[boundary] not in non_fixed_boundary_types:
-                    # integrate momentum on outflow boundaries
-                    # (where pressure is fixed)
-                    bccode += "Integral(" + boundary + ",\"VlFlx2\",1)\n"
-                    bccode += "nor:=NormalVector\n"
-                    bccode += "vf:=VolumeFunction\n"
-                    bccode += "rhoEff=phi(.)*rho2+(1-phi(.))*rho1\n"
-                    bccode += "up:=u(.)\n"
-                    bccode += "If up dot nor > 0.0\n"
-                    bccode += "r[0] <- sc*(rhoEff*u[0](.)*u(.) dot nor)*vf\n"
-                    bccode += "r[1] <- sc*(rhoEff*u[1](.)*u(.) dot nor)*vf\n"
-                    bccode += "r[2] <- sc*(rhoEff*u[2](.)*u(.) dot nor)*vf\n"
-                    bccode += "EndIf\n"
-                    bccode += "EndIntegral\n"
-            for boundary in velocityBCs:
-                if boundary not in boundaries:
-                    boundaries.append(boundary)
-                if velocityBCs[boundary] not in non_fixed_boundary_types:
-                    velo = to_numerrin_expression(velocityBCs[boundary][1])
-                    bccode += "Constraint(" + boundary + ",V)\n"
-                    bccode += " up=u(.)\n"
-                    bccode += " r[0] <- up[0] - " + velo[0] + "\n"
-                    bccode += " r[1] <- up[1] - " + velo[1] + "\n"
-                    bccode += " r[2] <- up[2] - " + velo[2] + "\n"
-                    bccode += "EndConstraint\n"
+            for domain, condition, members in fixed_pressure_groups:
+                # integrate momentum on outflow boundaries
+                # (where pressure is fixed)
+                bccode += "Integral(" + domain + ",\"VlFlx2\",1)\n"
+                bccode += "nor:=NormalVector\n"
+                bccode += "vf:=VolumeFunction\n"
+                bccode += "rhoEff=phi(.)*rho2+(1-phi(.))*rho1\n"
+                bccode += "up:=u(.)\n"
+                bccode += "If up dot nor > 0.0\n"
+                bccode += "r[0] <- sc*(rhoEff*u[0](.)*u(.) dot nor)*vf\n"
+                bccode += "r[1] <- sc*(rhoEff*u[1](.)*u(.) dot nor)*vf\n"
+                bccode += "r[2] <- sc*(rhoEff*u[2](.)*u(.) dot nor)*vf\n"
+                bccode += "EndIf\n"
+                bccode += "EndIntegral\n"
 
             volumeFractionBCs = BC[CUBA.VOLUME_FRACTION]
             check_boundary_names(volumeFractionBCs, mesh._boundaries.keys(),
                                  CUBA.VOLUME_FRACTION)
+            boundaries |= set(volumeFractionBCs)
 
-            for boundary in volumeFractionBCs:
-                if boundary not in boundaries:
-                    boundaries.append(boundary)
-                if volumeFractionBCs[boundary] not in non_fixed_boundary_types:
-                    bccode += "Constraint(" + boundary + ",W)\n"
+            for domain, condition, members in boundary_groups(
+                    volumeFractionBCs, name, numname[CUBA.VOLUME_FRACTION]):
+                if condition not in non_fixed_boundary_types:
+                    groups.append((domain, condition, members))
+                    bccode += "Constraint(" + domain + ",W)\n"
                     bccode += " r[3] <- phi(.) - " +\
-                        to_numerrin_expression(volumeFractionBCs[boundary][1])\
-                        + "\n"
+                        bc_variable_name(domain, CUBA.VOLUME_FRACTION) +\
+                        "\n"
                     bccode += "EndConstraint\n"
 
-        # integrate flux over boundaries
-        if solver == "VOFLaminar":
-            for boundary in boundaries:
+        # integrate flux over all boundaries
+        boundaries = sorted(boundaries)
+        if len(boundaries) > 1:
+            boundary = name + "Boundaries"
+            groups.append((boundary, None, boundaries))
+        elif boundaries:
+            boundary = name + boundaries[0]
+        if boundaries:
+            if solver == "VOFLaminar":
                 bccode += "Integral(" + boundary + ",\"VlFlx1\",3)\n"
                 bccode += "nor:=NormalVector\n"
                 bccode += "vf:=VolumeFunction\n"
                 bccode += "r[3] <- sc*phi(.)*(u(.) dot nor)*vf\n"
                 bccode += "r[4] <- sc*u(.) dot nor*vf\n"
                 bccode += "EndIntegral\n"
-        elif solver == "mixtureModelLaminar":
-            r_code = relative_velocity_code(SPExt)
-            for boundary in boundaries:
+            elif solver == "mixtureModelLaminar":
+                r_code = relative_velocity_code(SPExt)
                 bccode += "Integral(" + boundary + ",\"VlFlx1\",3)\n"
                 bccode += "nor:=NormalVector\n"
                 bccode += "vf:=VolumeFunction\n"
@@ -307,8 +493,7 @@ class NumerrinCode(object):
                 bccode += "+ coef*vr) dot nor)*vf\n"
                 bccode += "r[4] <- sc*rhom*u(.) dot nor*vf\n"
                 bccode += "EndIntegral\n"
-        elif solver == 'timeDependentLaminar':
-            for boundary in boundaries:
+            elif solver == 'timeDependentLaminar':
                 bccode += "Integral(" + boundary + ",\"VlFlx1\",3)\n"
                 bccode += "nor:=NormalVector\n"
                 bccode += "vf:=VolumeFunction\n"
@@ -319,49 +504,42 @@ class NumerrinCode(object):
             i = 4
         else:
             i = 3
-        for boundary in velocityBCs:
-            if velocityBCs[boundary] in zero_normal_velocity_types:
-                i += 1
-                bccode += "Integral(" + boundary + ",\"Lobatto\",2)\n"
-                bccode += "nor:=NormalVector\n"
-                bccode += "bf:=BasisFunction(V(.))\n"
-                bccode += "r[0] <- lambda" + boundary + "(.)*nor[0]*bf\n"
-                bccode += "r[1] <- lambda" + boundary + "(.)*nor[1]*bf\n"
-                bccode += "r[2] <- lambda" + boundary + "(.)*nor[2]*bf\n"
-                bccode += "EndIntegral\n"
-
-                bccode += "Integral(" + boundary + ",\"Lobatto\",2)\n"
-                bccode += "nor:=NormalVector\n"
-                bccode += "r[" + str(i) +\
-                    "] <- (u(.) dot nor)*BasisFunction(Z" + boundary +\
-                    "(.))\n"
-                bccode += "EndIntegral\n"
+        # domains of zero normal velocity groups are defined in
+        # initialization code
+        for domain, condition, members in slip_groups:
+            i += 1
+            bccode += "Integral(" + domain + ",\"Lobatto\",2)\n"
+            bccode += "nor:=NormalVector\n"
+            bccode += "bf:=BasisFunction(V(.))\n"
+            bccode += "r[0] <- lambda" + domain + "(.)*nor[0]*bf\n"
+            bccode += "r[1] <- lambda" + domain + "(.)*nor[1]*bf\n"
+            bccode += "r[2] <- lambda" + domain + "(.)*nor[2]*bf\n"
+            bccode += "EndIntegral\n"
+
+            bccode += "Integral(" + domain + ",\"Lobatto\",2)\n"
+            bccode += "nor:=NormalVector\n"
+            bccode += "r[" + str(i) +\
+                "] <- (u(.) dot nor)*BasisFunction(Z" + domain +\
+                "(.))\n"
+            bccode += "EndIntegral\n"
 
         if solver in multiphase_solvers:
             i = 4
         else:
             i = 3
-        for boundary in pressureBCs:
-            if boundary not in boundaries:
-                boundaries.append(boundary)
-            if pressureBCs[boundary] not in non_fixed_boundary_types:
-                bccode += "Constraint(" + boundary + ",W)\n"
-                bccode += " r[" + str(i) + "] <- p(.) - " +\
-                    to_numerrin_expression(pressureBCs[boundary][1]) +\
-                    "\n"
-                bccode += "EndConstraint\n"
-
-        for boundary in velocityBCs:
-            if boundary not in boundaries:
-                boundaries.append(boundary)
-            if velocityBCs[boundary] not in non_fixed_boundary_types:
-                velo = to_numerrin_expression(velocityBCs[boundary][1])
-                bccode += "Constraint(" + boundary + ",V)\n"
-                bccode += " up=u(.)\n"
-                bccode += " r[0] <- up[0] - " + velo[0] + "\n"
-                bccode += " r[1] <- up[1] - " + velo[1] + "\n"
-                bccode += " r[2] <- up[2] - " + velo[2] + "\n"
-                bccode += "EndConstraint\n"
+        for domain, condition, members in fixed_pressure_groups:
+            bccode += "Constraint(" + domain + ",W)\n"
+            bccode += " r[" + str(i) + "] <- p(.) - " +\
+                bc_variable_name(domain, CUBA.PRESSURE) + "\n"
+            bccode += "EndConstraint\n"
+
+        bccode += velocity_code
+
+        # union domains of boundary groups
+        for domain, condition, members in groups:
+            if len(members) > 1:
+                code += union_code(
+                    domain, [name + member for member in members])[0]
 
         # time loop and initializations
         code += timeLoop[solver]
@@ -399,6 +577,30 @@ class NumerrinCode(object):
         # time loop end
         code += "EndFor\n"
 
+#        code += "WriteCGNS(\"tulos.cgns\") "+name+",u,p\n"
+        return optimize_code(code)
+
+    def generate_copy_back_code(self, CM, CMExt):
+        """ generate Numerrin code copying solver variables to point
+            variables
+
+        Parameters
+        ----------
+        CM : DataContainer
+            Computational Method
+        CMExt : dictionary
+            extension to CM
+
+        Return
+        ------
+        code : str
+            Numerrin code as a string
+
+        """
+
+        name = CM[CUBA.NAME]
+        solver = get_numerrin_solver(CMExt)
+        code = ""
         # move solver variable values to point values
         for variable in solver_variables[solver]:
             pool_name = name + numname[variable]
@@ -417,5 +619,33 @@ class NumerrinCode(object):
                     solver_variable_names[variable] + "(.)\n"
                 code += "EndConstraint\n"
 
-#        code += "WriteCGNS(\"tulos.cgns\") "+name+",u,p\n"
         return code
+
+
+_run_time_settings = (CUBAExt.NUMBER_OF_CORES, CUBAExt.DEBUG_CODE_FILE)
+
+
+def _frozen(value):
+    """ hashable and comparable copy of nested settings """
+    if isinstance(value, dict) or hasattr(value, 'items'):
+        return tuple(sorted((_frozen(k), _frozen(v))
+                            for k, v in value.items()))
+    elif isinstance(value, (list, tuple)):
+        return tuple(_frozen(v) for v in value)
+    return value
+
+
+def _fingerprint(CM, SPExt, BC, CMExt, mesh, init, copy_back):
+    """ fingerprint of settings affecting generated code """
+    # boundary condition values are read from pool, only types and
+    # grouping of boundaries matter
+    bc_types = dict((cuba, [(condition if isinstance(condition, str) else
+                             condition[0], members)
+                            for domain, condition, members in
+                            boundary_groups(BC[cuba], "", cuba.name)])
+                    for cuba in BC.keys())
+    # run time settings do not affect the code
+    CMExt = dict((key, value) for key, value in CMExt.items()
+                 if key not in _run_time_settings)
+    return _frozen((CM, SPExt, bc_types, CMExt, mesh.name,
+                    sorted(mesh._boundaries.keys()), init, copy_back))
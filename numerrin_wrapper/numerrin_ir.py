@@ -0,0 +1,364 @@
+""" numerrin_ir
+
+Intermediate representation of generated Numerrin code and
+optimization passes on it
+
+"""
+
+import re
+
+
+_block_kinds = ("Integral", "Constraint")
+_excluded_calls = ("Grad", "BasisCoefficients", "BasisFunction")
+_identifier = re.compile(r"[A-Za-z_]\w*")
+_assignment = re.compile(r"^\s*([A-Za-z_]\w*)\s*(\[[^\]]*\])?\s*"
+                         r"(:=|=(?!=)|[-+*/]=)")
+_definition = re.compile(r"^\s*([A-Za-z_]\w*)\s*:?=(?!=)")
+_evaluation = re.compile(r"\b([A-Za-z_]\w*)((?:\[\d+\])?)\(\.\)")
+_excluded_call = re.compile(r"\b(?:" + "|".join(_excluded_calls) + r")\(")
+
+
+class CodeBlock(object):
+    """ Integral or Constraint block of Numerrin code
+
+    Parameters
+    ----------
+    kind : str
+        block kind, Integral or Constraint
+    arguments : str
+        arguments of the block, domain first
+    header : str
+        header line of the block
+    statements : list of str
+        lines inside the block
+    footer : str
+        end line of the block
+
+    """
+
+    def __init__(self, kind, arguments, header, statements, footer):
+        self.kind = kind
+        self.arguments = arguments
+        self.header = header
+        self.statements = statements
+        self.footer = footer
+
+    def lines(self):
+        """ lines of code of the block
+
+        Return
+        ------
+        lines : list of str
+            header, statements and end lines
+
+        """
+        return [self.header] + self.statements + [self.footer]
+
+
+def parse_code(code):
+    """ parse Numerrin code to intermediate representation
+
+    Parameters
+    ----------
+    code : str
+        Numerrin code
+
+    Return
+    ------
+    items : list
+        code lines (str) outside blocks and CodeBlock objects
+
+    """
+
+    items = []
+    block = None
+    for line in code.split("\n"):
+        stripped = line.strip()
+        if block is None:
+            for kind in _block_kinds:
+                if stripped.startswith(kind + "(") and\
+                        stripped.endswith(")"):
+                    block = CodeBlock(kind, stripped[len(kind) + 1:-1],
+                                      line, [], None)
+                    break
+            else:
+                items.append(line)
+        elif stripped == "End" + block.kind:
+            block.footer = line
+            items.append(block)
+            block = None
+        else:
+            block.statements.append(line)
+    if block is not None:
+        # unterminated block is kept as it is
+        items.append(block.header)
+        items.extend(block.statements)
+    return items
+
+
+def write_code(items):
+    """ write intermediate representation as Numerrin code
+
+    Parameters
+    ----------
+    items : list
+        code lines and CodeBlock objects
+
+    Return
+    ------
+    code : str
+        Numerrin code
+
+    """
+
+    lines = []
+    for item in items:
+        if isinstance(item, CodeBlock):
+            lines.extend(item.lines())
+        else:
+            lines.append(item)
+    return "\n".join(lines)
+
+
+def merge_integrals(items):
+    """ merge adjacent integrals over the same domain and quadrature
+
+    Integrals separated only by empty lines are merged unless a local
+    variable is defined in both but not by one identical top level
+    definition in each, or the latter one uses a local variable of the
+    former one without defining it. Identical local definitions are
+    included only once.
+
+    Parameters
+    ----------
+    items : list
+        code lines and CodeBlock objects
+
+    Return
+    ------
+    items : list
+        code lines and CodeBlock objects
+
+    """
+
+    merged = []
+    previous = None
+    blanks = []
+    for item in items:
+        if isinstance(item, CodeBlock):
+            if previous is not None and _can_merge(previous, item):
+                previous.statements.extend(_new_statements(previous, item))
+                blanks = []
+                continue
+            merged.extend(blanks)
+            blanks = []
+            merged.append(item)
+            previous = item
+        elif previous is not None and item.strip() == "":
+            blanks.append(item)
+        else:
+            merged.extend(blanks)
+            blanks = []
+            merged.append(item)
+            previous = None
+    merged.extend(blanks)
+    return merged
+
+
+def hoist_evaluations(block):
+    """ replace repeated function evaluations in a block with locals
+
+    Evaluations like u(.) and u[0](.) occurring more than once, at
+    least once outside If and For branches, are evaluated once to a
+    local variable (uEval, u0Eval) at the start of the block.
+    Evaluations inside Grad, BasisCoefficients and BasisFunction are
+    left as they are.
+
+    Parameters
+    ----------
+    block : CodeBlock
+        block of code, changed in place
+
+    """
+
+    assigned = set()
+    used = set()
+    counts = {}
+    top_level = set()
+    order = []
+    depth = 0
+    for line in block.statements:
+        if _is_comment(line):
+            continue
+        keyword = _keyword(line)
+        if keyword in ("endif", "endfor"):
+            depth -= 1
+        match = _assignment.match(line)
+        if match:
+            assigned.add(match.group(1))
+        used.update(_identifier.findall(line))
+        for evaluation in _evaluations(line):
+            if evaluation.group(0) not in counts:
+                counts[evaluation.group(0)] = 0
+                order.append(evaluation)
+            counts[evaluation.group(0)] += 1
+            if depth == 0:
+                top_level.add(evaluation.group(0))
+        if keyword in ("if", "for"):
+            depth += 1
+
+    local_names = {}
+    for evaluation in order:
+        expression = evaluation.group(0)
+        name = evaluation.group(1)
+        local_name = name + evaluation.group(2)[1:-1] + "Eval"
+        # evaluations only inside branches are not moved out of them
+        if counts[expression] > 1 and expression in top_level and\
+                name not in assigned and local_name not in used:
+            local_names[expression] = local_name
+    if not local_names:
+        return
+
+    statements = []
+    for line in block.statements:
+        if not _is_comment(line):
+            line = _replace_evaluations(line, local_names)
+        statements.append(line)
+    indent = ""
+    for line in block.statements:
+        if line.strip():
+            indent = line[:len(line) - len(line.lstrip())]
+            break
+    definitions = [indent + local_names[evaluation.group(0)] + ":=" +
+                   evaluation.group(0) for evaluation in order
+                   if evaluation.group(0) in local_names]
+    block.statements = definitions + statements
+
+
+def optimize_code(code):
+    """ optimize Numerrin code
+
+    Adjacent integrals over the same domain and quadrature are merged
+    and repeated function evaluations in integrals and constraints are
+    hoisted to local variables.
+
+    Parameters
+    ----------
+    code : str
+        Numerrin code
+
+    Return
+    ------
+    code : str
+        optimized Numerrin code
+
+    """
+
+    items = merge_integrals(parse_code(code))
+    for item in items:
+        if isinstance(item, CodeBlock):
+            hoist_evaluations(item)
+    return write_code(items)
+
+
+def _is_comment(line):
+    return line.lstrip().startswith("%")
+
+
+def _keyword(line):
+    words = line.split()
+    return words[0].lower() if words else ""
+
+
+def _excluded_spans(line):
+    spans = []
+    for match in _excluded_call.finditer(line):
+        depth = 0
+        for i in range(match.end() - 1, len(line)):
+            if line[i] == "(":
+                depth += 1
+            elif line[i] == ")":
+                depth -= 1
+                if depth == 0:
+                    break
+        spans.append((match.end(), i))
+    return spans
+
+
+def _evaluations(line):
+    spans = _excluded_spans(line)
+    return [match for match in _evaluation.finditer(line)
+            if not any(start <= match.start() < end
+                       for start, end in spans)]
+
+
+def _replace_evaluations(line, local_names):
+    result = ""
+    position = 0
+    for match in _evaluations(line):
+        if match.group(0) in local_names:
+            result += line[position:match.start()] +\
+                local_names[match.group(0)]
+            position = match.end()
+    return result + line[position:]
+
+
+def _definitions(block):
+    # local definitions as (name, statement, top level) tuples
+    definitions = []
+    depth = 0
+    for line in block.statements:
+        keyword = _keyword(line)
+        if keyword in ("endif", "endfor"):
+            depth -= 1
+        match = _definition.match(line)
+        if match:
+            definitions.append((match.group(1), line.strip(), depth == 0))
+        if keyword in ("if", "for"):
+            depth += 1
+    return definitions
+
+
+def _can_merge(first, second):
+    if first.kind != "Integral" or second.kind != "Integral" or\
+            first.arguments != second.arguments:
+        return False
+    first_definitions = {}
+    for name, statement, top_level in _definitions(first):
+        first_definitions.setdefault(name, []).append((statement,
+                                                       top_level))
+    second_definitions = {}
+    for name, statement, top_level in _definitions(second):
+        second_definitions.setdefault(name, []).append((statement,
+                                                        top_level))
+    # a local defined in both blocks must be defined once at top level
+    # in both with the same statement
+    for name in second_definitions:
+        if name not in first_definitions:
+            continue
+        if len(first_definitions[name]) != 1 or\
+                len(second_definitions[name]) != 1:
+            return False
+        if first_definitions[name][0] != second_definitions[name][0] or\
+                not first_definitions[name][0][1]:
+            return False
+    used = set()
+    for line in second.statements:
+        if not _is_comment(line):
+            used.update(_identifier.findall(line))
+    for name in first_definitions:
+        if name in used and name not in second_definitions:
+            return False
+    return True
+
+
+def _new_statements(first, second):
+    # statements of second block without the local definitions already
+    # done in the first one
+    done = set(name for name, statement, top_level in _definitions(first))
+    statements = []
+    for line in second.statements:
+        match = _definition.match(line)
+        if not (match and match.group(1) in done):
+            statements.append(line)
+    return statements
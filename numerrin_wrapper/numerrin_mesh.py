@@ -8,12 +8,21 @@ from simphony.cuds.abc_mesh import ABCMesh
 from simphony.core.cuba import CUBA
 from simphony.cuds.mesh import Point, Edge, Face, Cell
 
+from .numerrin_code import NumerrinCode
 from .numerrin_templates import (numname, numvariables,
-                                 solver_variables, variable_dimension)
+                                 solver_variables, variable_dimension,
+                                 boundary_integral_code)
+from .numerrin_ir import optimize_code
 
 import simphony.core.data_container as dc
 
-import numerrin
+import numpy
+
+# cost of a modify_variable call in number of transferred values
+_modify_call_cost = 64
+
+_item_levels = {CUBA.EDGE: 1, CUBA.FACE: 2, CUBA.CELL: 3}
+_item_classes = {CUBA.EDGE: Edge, CUBA.FACE: Face, CUBA.CELL: Cell}
 
 
 class NumerrinMesh(ABCMesh):
@@ -41,47 +50,517 @@ class NumerrinMesh(ABCMesh):
     pool : NumerrinPool
        Numerrin variable pool
 
-    _uuidToNumLabel : dictionary
+    _uuidToNumLabel : UuidIndex
         Mapping from uuid to Numerrin label number
-    _numCellLabelToUuid : dictionary
-        Mapping from Numerrin cell label number to uuid
-    _numFaceLabelToUuid : dictionary
-        Mapping from Numerrin face label number to uuid
-    _numEdgeLabelToUuid : dictionary
-        Mapping from Numerrin edge label number to uuid
-    _numPointLabelToUuid : dictionary
-        Mapping from Numerrin point label number to uuid
-
+    _numCellLabelToUuid : UuidArrayMap or DerivedUuidMap
+        Mapping between Numerrin cell label numbers and uuids
+    _numFaceLabelToUuid : UuidArrayMap or DerivedUuidMap
+        Mapping between Numerrin face label numbers and uuids
+    _numEdgeLabelToUuid : UuidArrayMap or DerivedUuidMap
+        Mapping between Numerrin edge label numbers and uuids
+    _numPointLabelToUuid : UuidArrayMap or DerivedUuidMap
+        Mapping between Numerrin point label numbers and uuids
+    buffered : bool
+        If True, point updates are kept in a buffer until flush is
+        called or the updated fields are read. Default False.
+
+    _fields : dictionary
+        Snapshot of point field values copied from the pool,
+        None for fields not in the pool
+    _pending : list
+        Buffered point updates as (labels, points) pairs
+    _boundary_faces : dictionary
+        Face label arrays by boundary name
+    _boundary_points : dictionary
+        Sorted unique point label arrays by boundary name, built
+        when first needed
+    _reduction_codes : dictionary
+        Parsed boundary reduction code by boundary name and expressions
+    _coordinates : numpy.ndarray
+        Read-only node coordinates, None until first needed
+    _connectivity : dictionary
+        Read-only connectivity arrays by mesh level, built when
+        first needed
 
     """
 
     def __init__(self, name, mesh, pool):
-        super(NumerrinMesh, self).__init__()
-        self.name = name
-        self.data = dc.DataContainer()
-        self.pool = pool
-        self._time = str(0)
-        self._boundaries = {}
+        self._setup(name, pool)
         maps = self.pool.import_mesh(name, mesh, self._boundaries)
 
         if hasattr(mesh, '_boundaries'):
-            boundary_faces = {}
             for boundary in mesh._boundaries:
-                boundary_faces[boundary] = []
-                for fuid in mesh._boundaries[boundary]:
-                    boundary_faces[boundary].append(maps[0][fuid])
-            self.pool.add_boundaries(name, mesh._boundaries,
-                                     boundary_faces)
+                self._boundary_faces[boundary] =\
+                    maps[3].labels(mesh._boundaries[boundary])
+            self.pool.add_boundaries(
+                name, mesh._boundaries,
+                dict((boundary, labels.tolist()) for boundary, labels
+                     in self._boundary_faces.items()))
             # this assumes that face uids are remained
             self._boundaries = mesh._boundaries
 
+        self._set_maps(maps)
+        # point data
+        self.update(mesh.iter(item_type=CUBA.POINT))
+
+    @classmethod
+    def from_arrays(cls, name, pool, points, cells, cell_types=None,
+                    boundaries=None, faces=None, face_types=None):
+        """ create mesh proxy for a mesh given as arrays
+
+        The mesh is imported to the pool without creating SimPhoNy
+        mesh objects. See NumerrinPool.import_arrays for the array
+        parameters.
+
+        Parameters
+        ----------
+        name : str
+            name of mesh
+        pool : NumerrinPool
+            Numerrin variable pool
+
+        Return
+        ------
+        mesh : NumerrinMesh
+            proxy of imported mesh
+
+        """
+
+        numerrin_mesh = cls.__new__(cls)
+        numerrin_mesh._setup(name, pool)
+        maps = pool.import_arrays(name, points, cells, cell_types,
+                                  boundaries, faces, face_types)
+        numerrin_mesh._set_maps(maps)
+        if boundaries is not None:
+            for boundary in boundaries:
+                labels = numpy.asarray(boundaries[boundary], dtype=int)
+                numerrin_mesh._boundary_faces[boundary] = labels
+                numerrin_mesh._boundaries[boundary] = maps[3].uuids(labels)
+        return numerrin_mesh
+
+    @classmethod
+    def from_pool(cls, name, pool, boundary_names):
+        """ create mesh proxy for a mesh created in Numerrin pool
+
+        The pool mesh and its boundary domains are used as they are,
+        uuids are derived from Numerrin labels on demand.
+
+        Parameters
+        ----------
+        name : str
+            name of mesh in pool
+        pool : NumerrinPool
+            Numerrin variable pool
+        boundary_names : list str
+            boundary names, boundary domains in pool are named
+            name+boundary
+
+        Return
+        ------
+        mesh : NumerrinMesh
+            proxy of pool mesh
+
+        """
+
+        numerrin_mesh = cls.__new__(cls)
+        numerrin_mesh._setup(name, pool)
+        maps, boundary_faces = pool.adopt_mesh(name, boundary_names)
+        numerrin_mesh._set_maps(maps)
+        for boundary in boundary_faces:
+            labels = numpy.asarray(boundary_faces[boundary], dtype=int)
+            numerrin_mesh._boundary_faces[boundary] = labels
+            numerrin_mesh._boundaries[boundary] = maps[3].uuids(labels)
+        return numerrin_mesh
+
+    def _setup(self, name, pool):
+        super(NumerrinMesh, self).__init__()
+        self.name = name
+        self.data = dc.DataContainer()
+        self.pool = pool
+        self._time = str(0)
+        self._boundaries = {}
+        self._boundary_faces = {}
+        self._boundary_points = {}
+        self._fields = {}
+        self.buffered = False
+        self._pending = []
+        self._coordinates = None
+        self._connectivity = {}
+        self._reduction_codes = {}
+
+    def _set_maps(self, maps):
         self._uuidToNumLabel = maps[0]
         self._numPointLabelToUuid = maps[1]
         self._numEdgeLabelToUuid = maps[2]
         self._numFaceLabelToUuid = maps[3]
         self._numCellLabelToUuid = maps[4]
-        # point data
-        self.update(mesh.iter(item_type=CUBA.POINT))
+
+    def get_boundary_labels(self, name, item_type=CUBA.FACE):
+        """ Return labels of faces or points on a boundary
+
+        Parameters
+        ----------
+        name : str
+            name of boundary
+        item_type : CUBA, optional
+            CUBA.FACE or CUBA.POINT
+
+        Return
+        ------
+        labels : numpy.ndarray
+            array of face labels or sorted array of unique point labels
+
+        Raises
+        ------
+        ValueError
+            If the boundary does not exist or item type is not
+            supported
+
+        """
+
+        if name not in self._boundary_faces:
+            if name not in self._boundaries:
+                error_str = "Trying to get a non-existing boundary: {}"
+                raise ValueError(error_str.format(name))
+            self._boundary_faces[name] =\
+                self._numFaceLabelToUuid.labels(self._boundaries[name])
+        if item_type == CUBA.FACE:
+            return self._boundary_faces[name]
+        elif item_type == CUBA.POINT:
+            if name not in self._boundary_points:
+                faces = self._boundary_faces[name]
+                if _item_levels[CUBA.FACE] in self._connectivity:
+                    nodes = self._connectivity[_item_levels[CUBA.FACE]][
+                        faces]
+                else:
+                    # only the boundary faces are read from the pool
+                    nodes, _ = self.pool.get_elements(
+                        self.name, _item_levels[CUBA.FACE], labels=faces)
+                self._boundary_points[name] = numpy.unique(nodes[nodes >= 0])
+            return self._boundary_points[name]
+        else:
+            error_str = 'Item type {} not supported'
+            raise ValueError(error_str.format(item_type))
+
+    def iter_boundary_points(self, name):
+        """ Returns an iterator over the points on a boundary
+
+        Parameters
+        ----------
+        name : str
+            name of boundary
+
+        Returns
+        -------
+        iter
+            Iterator over the boundary points in label order
+
+        """
+
+        uuid_map = self._numPointLabelToUuid
+        for label in self.get_boundary_labels(name, CUBA.POINT).tolist():
+            yield self._make_point(label, uuid_map[label])
+
+    def get_boundary_field(self, name, dkey):
+        """ Return values of a point field on a boundary
+
+        Parameters
+        ----------
+        name : str
+            name of boundary
+        dkey : CUBA
+            CUBA key of the field
+
+        Return
+        ------
+        values : numpy.ndarray
+            field values of the boundary points in the order of
+            get_boundary_labels(name, CUBA.POINT)
+
+        """
+
+        return self.get_field(dkey)[self.get_boundary_labels(name,
+                                                             CUBA.POINT)]
+
+    def boundary_area(self, name):
+        """ Return area of a boundary
+
+        Parameters
+        ----------
+        name : str
+            name of boundary
+
+        Return
+        ------
+        area : float
+            area of boundary
+
+        """
+
+        return self._integrate_boundary(name, ["1.0"])[0]
+
+    def boundary_flow_rate(self, name, density=None):
+        """ Return flow rate through a boundary
+
+        The flow rate is integrated from the velocity field in the
+        direction of the boundary outward normal.
+
+        Parameters
+        ----------
+        name : str
+            name of boundary
+        density : float, optional
+            density for mass flow rate, by default volume flow rate
+            is returned
+
+        Return
+        ------
+        flow_rate : float
+            volume or mass flow rate through boundary
+
+        """
+
+        expression = "(" + self.name + numname[CUBA.VELOCITY] +\
+            "(.) dot nor)"
+        if density is not None:
+            expression = str(float(density)) + "*" + expression
+        return self._integrate_boundary(name, [expression])[0]
+
+    def boundary_force(self, name):
+        """ Return pressure force on a boundary
+
+        Parameters
+        ----------
+        name : str
+            name of boundary
+
+        Return
+        ------
+        force : tuple
+            pressure force components integrated over boundary
+
+        """
+
+        pressure = self.name + numname[CUBA.PRESSURE] + "(.)"
+        return tuple(self._integrate_boundary(
+            name, [pressure + "*nor[" + str(i) + "]" for i in range(3)]))
+
+    def boundary_average(self, name, dkey):
+        """ Return area average of a point field on a boundary
+
+        Parameters
+        ----------
+        name : str
+            name of boundary
+        dkey : CUBA
+            CUBA key of the field
+
+        Return
+        ------
+        average : float or tuple
+            average of field or field components over boundary
+
+        """
+
+        vname = self.name + numname[dkey]
+        v_size = variable_dimension[dkey]
+        if v_size > 1:
+            expressions = [vname + "[" + str(i) + "](.)"
+                           for i in range(v_size)]
+        else:
+            expressions = [vname + "(.)"]
+        values = self._integrate_boundary(name, ["1.0"] + expressions)
+        averages = [value / values[0] for value in values[1:]]
+        if v_size > 1:
+            return tuple(averages)
+        return averages[0]
+
+    def _integrate_boundary(self, name, expressions):
+        """ Integrate expressions over a boundary in Numerrin
+
+        Parameters
+        ----------
+        name : str
+            name of boundary
+        expressions : list of str
+            Numerrin expressions, nor is the boundary normal
+
+        Return
+        ------
+        values : list of float
+            integrals of expressions
+
+        Raises
+        ------
+        ValueError
+            If the boundary does not exist
+
+        """
+
+        if name not in self._boundaries:
+            error_str = "Trying to integrate over a non-existing boundary: {}"
+            raise ValueError(error_str.format(name))
+        self.flush()
+        result_names = [self.name + "Reduction" + str(i)
+                        for i in range(len(expressions))]
+        key = (name, tuple(expressions))
+        if key not in self._reduction_codes:
+            code = NumerrinCode(self.pool.ph)
+            code.parse_string(
+                optimize_code(boundary_integral_code(self.name + name,
+                                                     expressions,
+                                                     result_names)))
+            self._reduction_codes[key] = code
+        self._reduction_codes[key].execute(1)
+        for result_name in result_names:
+            self.pool.invalidate_metadata(result_name)
+        return [float(self.pool.get_variable(result_name))
+                for result_name in result_names]
+
+    def _field_values(self, dkey):
+        """ Return snapshot of point field values
+
+        The field is copied from the pool on first access and
+        kept until clear_field_cache is called.
+
+        Parameters
+        ----------
+        dkey : CUBA
+            CUBA key of the field
+
+        Return
+        ------
+        values : list or None
+            field values by point label, None if field not in pool
+
+        """
+
+        self.flush()
+        if dkey not in self._fields:
+            mDataName = self.name + numname[dkey]
+            if not self.pool.exists(mDataName):
+                dataV = None
+            elif self.pool.variable_type(mDataName) == "Function":
+                dataV = list(self.pool.get_real_function(mDataName))
+            else:
+                dataV = list(self.pool.get_variable(mDataName))
+            self._fields[dkey] = dataV
+        return self._fields[dkey]
+
+    def clear_field_cache(self):
+        """ Clear snapshot of point field values
+
+        Has to be called when the field values in the pool change.
+
+        """
+
+        self._fields = {}
+
+    def get_coordinates(self):
+        """ Return coordinates of all points
+
+        Return
+        ------
+        coordinates : numpy.ndarray
+            read-only (n_points, 3) array of point coordinates in
+            label order
+
+        """
+
+        if self._coordinates is None:
+            coordinates = self.pool.get_nodes(self.name)
+            coordinates.flags.writeable = False
+            self._coordinates = coordinates
+        return self._coordinates
+
+    def get_connectivity(self, item_type):
+        """ Return connectivity of all edges, faces or cells
+
+        Parameters
+        ----------
+        item_type : CUBA
+            CUBA.EDGE, CUBA.FACE or CUBA.CELL
+
+        Return
+        ------
+        connectivity : numpy.ndarray
+            read-only (n_elements, n_nodes) array of point labels in
+            SimPhoNy node order, rows of elements with less nodes
+            padded with -1
+
+        """
+
+        level = _item_levels[item_type]
+        if level not in self._connectivity:
+            connectivity, _ = self.pool.get_elements(self.name, level)
+            connectivity.flags.writeable = False
+            self._connectivity[level] = connectivity
+        return self._connectivity[level]
+
+    def get_field(self, dkey):
+        """ Return values of a point field
+
+        Parameters
+        ----------
+        dkey : CUBA
+            CUBA key of the field
+
+        Return
+        ------
+        values : numpy.ndarray
+            (n_points, n_components) array of field values in point
+            label order, (n_points,) array for scalar fields
+
+        Raises
+        ------
+        ValueError
+            If the field is not in the pool
+
+        """
+
+        dataV = self._field_values(dkey)
+        if dataV is None:
+            error_str = "Trying to get a non-existing field: {}"
+            raise ValueError(error_str.format(dkey))
+        return numpy.array(dataV, dtype=float)
+
+    def set_field(self, dkey, values):
+        """ Set values of a point field
+
+        The field is created to the pool if it does not exist.
+
+        Parameters
+        ----------
+        dkey : CUBA
+            CUBA key of the field
+        values : array_like
+            (n_points, n_components) array of field values in point
+            label order, (n_points,) array for scalar fields. Value
+            of a single point is broadcast to all points.
+
+        """
+
+        self.flush()
+        vname = self.name + numname[dkey]
+        v_size = variable_dimension[dkey]
+        shape = (self.count_of(CUBA.POINT),)
+        if v_size > 1:
+            shape += (v_size,)
+        values = numpy.broadcast_to(numpy.asarray(values, dtype=float),
+                                    shape)
+        if not self.pool.exists(vname):
+            self._create_point_variable(vname, v_size)
+        self._modify_field(vname, values)
+        self._fields.pop(dkey, None)
+
+    def _create_point_variable(self, vname, v_size):
+        # Lagrange 1 space
+        space_name = vname + "LS1"
+        domain_name = "omega"
+        self.pool.create_space(space_name, domain_name,
+                               'Lagrange', 1)
+        self.pool.create_realfunction(vname, space_name,
+                                      v_size)
 
     def _get_point(self, uuid):
         """Returns a point with a given uuid.
@@ -108,25 +587,24 @@ class NumerrinMesh(ABCMesh):
         """
 
         try:
-            coords = numerrin.getnode(self.pool.ph, self.name,
-                                      self._uuidToNumLabel[uuid])
-            point = Point(coords, uuid)
-            for dkey in numvariables:
-                dataName = numname[dkey]
-                mDataName = self.name + dataName
-                try:
-                    if self.pool.variable_type(mDataName) == "Function":
-                        dataV = self.pool.get_real_function(mDataName)
-                    else:
-                        dataV = self.pool.get_variable(mDataName)
-                    point.data[dkey] = dataV[self._uuidToNumLabel[uuid]]
-                except RuntimeError:
-                    pass
-
-            return point
+            label = self._numPointLabelToUuid.label(uuid)
         except KeyError:
             error_str = "Trying to get an non-existing point with uuid: {}"
             raise ValueError(error_str.format(uuid))
+        return self._make_point(label, uuid)
+
+    def _make_point(self, label, uuid):
+        point = Point(tuple(self.get_coordinates()[label].tolist()), uuid)
+        for dkey in numvariables:
+            dataV = self._field_values(dkey)
+            if dataV is not None:
+                point.data[dkey] = dataV[label]
+        return point
+
+    def _make_element(self, item_type, label, uuid):
+        nodes = self.get_connectivity(item_type)[label]
+        puids = self._numPointLabelToUuid.uuids(nodes[nodes >= 0])
+        return _item_classes[item_type](puids, uuid)
 
     def _get_edge(self, uuid):
         """Returns an edge with a given uuid.
@@ -153,10 +631,8 @@ class NumerrinMesh(ABCMesh):
         """
 
         try:
-            pointLabels = self.pool.get_edge_points(self.name,
-                                                    self._uuidToNumLabel[uuid])
-            puids = [self._numPointLabelToUuid[lbl] for lbl in pointLabels]
-            return Edge(puids, uuid)
+            label = self._numEdgeLabelToUuid.label(uuid)
+            return self._make_element(CUBA.EDGE, label, uuid)
         except KeyError:
             error_str = "Trying to get an non-existing edge with uuid: {}"
             raise ValueError(error_str.format(uuid))
@@ -186,11 +662,8 @@ class NumerrinMesh(ABCMesh):
         """
 
         try:
-            pointLabels = self.pool.get_face_points(self.name,
-                                                    self._uuidToNumLabel[uuid])
-            puids = [self._numPointLabelToUuid[lbl] for lbl in pointLabels]
-            face = Face(puids, uuid)
-            return face
+            label = self._numFaceLabelToUuid.label(uuid)
+            return self._make_element(CUBA.FACE, label, uuid)
         except KeyError:
             error_str = "Trying to get an non-existing face with uuid: {}"
             raise ValueError(error_str.format(uuid))
@@ -220,12 +693,8 @@ class NumerrinMesh(ABCMesh):
         """
 
         try:
-            pointLabels = self.pool.get_cell_points(self.name,
-                                                    self._uuidToNumLabel[uuid])
-            puids = [self._numPointLabelToUuid[lbl] for lbl in pointLabels]
-            cell = Cell(puids, uuid)
-            return cell
-
+            label = self._numCellLabelToUuid.label(uuid)
+            return self._make_element(CUBA.CELL, label, uuid)
         except KeyError:
             error_str = "Trying to get an non-existing cell with uuid: {}"
             raise ValueError(error_str.format(uuid))
@@ -250,18 +719,11 @@ class NumerrinMesh(ABCMesh):
         for dkey in solver_variables[solver]:
             dataName = numname[dkey]
             vname = self.name + dataName
-            try:
-                self.pool.get_real_function(vname)
-            except:
+            if not self.pool.exists(vname):
                 # create variable if not in pool
-                v_size = variable_dimension[dkey]
-                # Lagrange 1 space
-                space_name = vname + "LS1"
-                domain_name = "omega"
-                self.pool.create_space(space_name, domain_name,
-                                       'Lagrange', 1)
-                self.pool.create_realfunction(vname, space_name,
-                                              v_size)
+                self._create_point_variable(vname,
+                                            variable_dimension[dkey])
+        self.clear_field_cache()
 
     def _update_points(self, points):
         """ Updates the information of a set of points.
@@ -270,6 +732,9 @@ class NumerrinMesh(ABCMesh):
         uuid as the provided point and updates its data
         with the one provided with the new point.
 
+        Only the changed label ranges of the pool variables are
+        modified, or the whole variable when that takes less calls.
+
         Parameters
         ----------
         points : iterable of Point
@@ -282,70 +747,123 @@ class NumerrinMesh(ABCMesh):
 
         """
 
-        vdata = {}
-        for point in points:
-            if point.uid not in self._uuidToNumLabel:
-                error_str =\
-                    "Trying to update a non-existing point with uuid: "\
-                    + str(point.uid)
-                raise KeyError(error_str)
-            label = self._uuidToNumLabel[point.uid]
-            for dkey in numvariables:
-                dataName = numname[dkey]
-                vname = self.name + dataName
-                if dkey in point.data:
-                    try:
-                        var = point.data[dkey]
-                        if vname not in vdata:
-                            point_list = self.pool.get_real_function(vname)
-                            if type(var) is tuple or type(var) is list:
-                                vdata[vname] =\
-                                    list(list([value[i] for value in
-                                               point_list])
-                                         for i in range(len(var)))
-                            else:
-                                vdata[vname] =\
-                                    list(list([value for value in
-                                               point_list])
-                                         for i in range(1))
-                        if type(var) is tuple or type(var) is list:
-                            for i in range(len(var)):
-                                vdata[vname][i][label] =\
-                                    float(var[i])
-                        else:
-                            vdata[vname][0][label] = float(var)
-                    except:
-                        # create variable if not in pool
-                        var = point.data[dkey]
-                        if type(var) is tuple or type(var) is list:
-                            v_size = len(var)
-                            vdata[vname] =\
-                                list(list([0 for _ in self._iter_points()])
-                                     for i in range(len(var)))
-                            for i in range(len(var)):
-                                vdata[vname][i][label] =\
-                                    float(var[i])
-                        else:
-                            v_size = 1
-                            vdata[vname] =\
-                                list(list([0 for _ in self._iter_points()])
-                                     for i in range(1))
-                            vdata[vname][0][label] = float(point.data[dkey])
-                        # Lagrange 1 space
-                        space_name = vname + "LS1"
-                        domain_name = "omega"
-                        self.pool.create_space(space_name, domain_name,
-                                               'Lagrange', 1)
-                        self.pool.create_realfunction(vname, space_name,
-                                                      v_size)
-
-        for vname in vdata:
-            for i in range(len(vdata[vname])):
-                if len(vdata[vname]) > 1:
-                    var_name = vname + "[" + str(i) + "][[:]]"
-                else:
-                    var_name = vname + "[[:]]"
-                self.pool.modify_variable(var_name, tuple(vdata[vname][i]))
+        points = list(points)
+        if not points:
+            return
+        try:
+            labels = self._numPointLabelToUuid.labels(
+                [point.uid for point in points])
+        except KeyError as e:
+            error_str =\
+                "Trying to update a non-existing point with uuid: "\
+                + str(e.args[0])
+            raise KeyError(error_str)
+
+        if self.buffered:
+            self._pending.append(
+                (labels, [Point(point.coordinates, point.uid,
+                                dc.DataContainer(point.data))
+                          for point in points]))
+        else:
+            self._write_points(points, labels)
+
+    def flush(self):
+        """ Write buffered point updates to the pool
+
+        """
+
+        if self._pending:
+            pending = self._pending
+            self._pending = []
+            labels = numpy.concatenate([item[0] for item in pending])
+            points = [point for item in pending for point in item[1]]
+            self._write_points(points, labels)
+
+    def _write_points(self, points, labels):
+        """ Write point data to the pool
+
+        Parameters
+        ----------
+        points : list of Point
+            Points to be written
+        labels : numpy.ndarray
+            Numerrin labels of points
+
+        """
+
+        for dkey in numvariables:
+            vname = self.name + numname[dkey]
+            selected = [i for i, point in enumerate(points)
+                        if dkey in point.data]
+            if not selected:
+                continue
+            values = numpy.array([points[i].data[dkey] for i in selected],
+                                 dtype=float)
+            # last value of a label wins
+            changed, last = numpy.unique(labels[selected][::-1],
+                                         return_index=True)
+            values = values[::-1][last]
+
+            if not self.pool.exists(vname):
+                v_size = values.shape[1] if values.ndim > 1 else 1
+                self._create_point_variable(vname, v_size)
+                field = numpy.zeros((self.count_of(CUBA.POINT),) +
+                                    values.shape[1:])
+            else:
+                field = None
+
+            # contiguous label ranges of changed points
+            breaks = numpy.flatnonzero(numpy.diff(changed) != 1) + 1
+            starts = numpy.concatenate(([0], breaks))
+            ends = numpy.concatenate((breaks, [len(changed)]))
+            point_count = self.count_of(CUBA.POINT)
+            if len(starts) * _modify_call_cost + len(changed) <\
+                    _modify_call_cost + point_count and field is None:
+                for start, end in zip(starts, ends):
+                    self._modify_field(vname, values[start:end],
+                                       changed[start], changed[end-1])
+            else:
+                if field is None:
+                    field = numpy.array(self._field_values(dkey),
+                                        dtype=float)
+                field[changed] = values
+                self._modify_field(vname, field)
+            # patch cached snapshot instead of copying the field again
+            cached = self._fields.get(dkey)
+            if cached is None:
+                self._fields.pop(dkey, None)
+            else:
+                for label, value in zip(changed.tolist(), values.tolist()):
+                    if values.ndim > 1:
+                        value = tuple(value)
+                    cached[label] = value
+
+    def _modify_field(self, vname, values, first=None, last=None):
+        """ Modify values of a point variable in pool
+
+        Parameters
+        ----------
+        vname : str
+            name of variable
+        values : numpy.ndarray
+            (n, n_components) or (n,) array of values
+        first, last : int, optional
+            label range of values, default all points
+
+        """
+
+        if first is None:
+            label_range = "[[:]]"
+        else:
+            label_range = "[[" + str(first) + ":" + str(last) + "]]"
+        if values.ndim > 1 and values.shape[1] > 1:
+            for i in range(values.shape[1]):
+                self.pool.modify_variable(
+                    vname + "[" + str(i) + "]" + label_range,
+                    tuple(values[:, i].tolist()))
+        else:
+            self.pool.modify_variable(vname + label_range,
+                                      tuple(values.ravel().tolist()))
 
     def _update_edges(self, edges):
         message = 'Edges update not supported yet'
@@ -381,13 +899,13 @@ class NumerrinMesh(ABCMesh):
         """
 
         if point_uuids is None:
-            pointCount = self.pool.mesh_size(self.name)[0]
-            for label in range(pointCount):
-                yield self._get_point(self._numPointLabelToUuid[label])
+            uuid_map = self._numPointLabelToUuid
+            for label in range(len(uuid_map)):
+                yield self._make_point(label, uuid_map[label])
         else:
-            for uid in point_uuids:
-                point = self._get_point(uid)
-                yield point
+            labels, uids = self._labels(CUBA.POINT, point_uuids)
+            for label, uid in zip(labels.tolist(), uids):
+                yield self._make_point(label, uid)
 
     def _iter_edges(self, edge_uuids=None):
         """Returns an iterator over the selected edges.
@@ -411,9 +929,9 @@ class NumerrinMesh(ABCMesh):
         """
 
         if edge_uuids is None:
-            edgeCount = self.pool.mesh_size(self.name)[1]
-            for label in range(edgeCount):
-                yield self._get_edge(self._numEdgeLabelToUuid[label])
+            uuid_map = self._numEdgeLabelToUuid
+            for label in range(len(uuid_map)):
+                yield self._make_element(CUBA.EDGE, label, uuid_map[label])
         else:
             for uid in edge_uuids:
                 edge = self._get_edge(uid)
@@ -441,9 +959,9 @@ class NumerrinMesh(ABCMesh):
         """
 
         if face_uuids is None:
-            faceCount = self.pool.mesh_size(self.name)[2]
-            for label in range(faceCount):
-                yield self._get_face(self._numFaceLabelToUuid[label])
+            uuid_map = self._numFaceLabelToUuid
+            for label in range(len(uuid_map)):
+                yield self._make_element(CUBA.FACE, label, uuid_map[label])
         else:
             for uid in face_uuids:
                 face = self._get_face(uid)
@@ -471,14 +989,108 @@ class NumerrinMesh(ABCMesh):
         """
 
         if cell_uuids is None:
-            cellCount = self.pool.mesh_size(self.name)[3]
-            for label in range(cellCount):
-                yield self._get_cell(self._numCellLabelToUuid[label])
+            uuid_map = self._numCellLabelToUuid
+            for label in range(len(uuid_map)):
+                yield self._make_element(CUBA.CELL, label, uuid_map[label])
         else:
             for uid in cell_uuids:
                 cell = self._get_cell(uid)
                 yield cell
 
+    def iter_chunks(self, item_type, chunk_size=10000, fields=None,
+                    uuids=None):
+        """ Returns an iterator over items in chunks of arrays
+
+        Parameters
+        ----------
+        item_type : CUBA
+            CUBA.POINT, CUBA.EDGE, CUBA.FACE or CUBA.CELL
+        chunk_size : int, optional
+            maximum number of items in a chunk
+        fields : list of CUBA, optional
+            CUBA keys of point fields to include, only for points
+        uuids : list of uuids, optional
+            uuids of the desired items, default all items in label
+            order
+
+        Returns
+        -------
+        iter
+            Iterator over (labels, uuids, values, field_values) tuples,
+            where labels is an array of Numerrin labels, uuids a list
+            of item uuids, values an array of point coordinates or
+            element connectivity (see get_connectivity) and
+            field_values a dictionary from CUBA key to array of field
+            values (see get_field)
+
+        Raises
+        ------
+        ValueError
+            If fields are given for other items than points or if some
+            of uuids was not found
+
+        """
+
+        if fields and item_type != CUBA.POINT:
+            error_str = 'Fields are not supported for item type {}'
+            raise ValueError(error_str.format(item_type))
+        if item_type == CUBA.POINT:
+            values = self.get_coordinates()
+        else:
+            values = self.get_connectivity(item_type)
+        field_values = dict((dkey, self.get_field(dkey))
+                            for dkey in (fields or []))
+
+        uuid_map = self._uuid_map(item_type)
+        if uuids is None:
+            labels = numpy.arange(len(uuid_map))
+        else:
+            labels, uuids = self._labels(item_type, uuids)
+        for start in range(0, len(labels), chunk_size):
+            chunk = labels[start:start+chunk_size]
+            if uuids is None:
+                chunk_uuids = uuid_map.uuids(chunk)
+            else:
+                chunk_uuids = uuids[start:start+chunk_size]
+            yield (chunk, chunk_uuids, values[chunk],
+                   dict((dkey, field_values[dkey][chunk])
+                        for dkey in field_values))
+
+    def _uuid_map(self, item_type):
+        if item_type == CUBA.POINT:
+            return self._numPointLabelToUuid
+        elif item_type == CUBA.EDGE:
+            return self._numEdgeLabelToUuid
+        elif item_type == CUBA.FACE:
+            return self._numFaceLabelToUuid
+        elif item_type == CUBA.CELL:
+            return self._numCellLabelToUuid
+        else:
+            error_str = 'Item type {} not supported'
+            raise ValueError(error_str.format(item_type))
+
+    def _labels(self, item_type, uuids):
+        """ Numerrin labels of uuids
+
+        Returns
+        -------
+        (labels, uuids) : tuple
+            array of labels and list of uuids
+
+        Raises
+        ------
+        ValueError
+            If some of uuids was not found
+
+        """
+
+        uuids = list(uuids)
+        try:
+            return (self._uuid_map(item_type).labels(uuids), uuids)
+        except KeyError as e:
+            error_str = "Trying to get an non-existing item with uuid: {}"
+            raise ValueError(error_str.format(e.args[0]))
+
     def _has_points(self):
         """Check if the mesh has points
 
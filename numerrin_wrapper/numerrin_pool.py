@@ -6,8 +6,14 @@ Module for operations on Numerrin pool
 from simphony.cuds.mesh import Mesh, Point, Edge, Face, Cell
 from simphony.core.cuba import CUBA
 
-from .numerrin_utils import (face_renode, cell_renode, generate_uuid)
-from .numerrin_templates import (numvariables, numname)
+from .numerrin_utils import (face_renode, cell_renode, generate_uuid,
+                             connectivity_array, numerrin_element_types,
+                             renode_connectivity, pack_connectivity,
+                             DerivedUuidMap, UuidArrayMap, UuidIndex)
+from .numerrin_code import NumerrinCode
+from .numerrin_templates import (numvariables, numname, field_stats_code)
+
+import numpy
 import numerrin
 
 
@@ -18,6 +24,19 @@ class NumerrinPool(object):
 
     def __init__(self):
         self.ph = numerrin.createpool()
+        # cached mesh sizes by mesh name, they do not change after
+        # the mesh has been created
+        self._mesh_sizes = {}
+        # cached variable types, ranks and sizes by variable name
+        self._metadata = {}
+        # names of variables, spaces and domains known to be in pool
+        self._registry = set()
+        # number of components of functions created through pool
+        self._function_sizes = {}
+        # parsed field statistics code by function name
+        self._stats_codes = {}
+        # boundary condition variables by mesh name
+        self._bc_variables = {}
 
     def __del__(self):
         numerrin.deletepool(self.ph)
@@ -44,70 +63,128 @@ class NumerrinPool(object):
 
         """
 
+        coordinates, connectivity, _, boundary_faces =\
+            self.export_arrays(name, boundary_names)
+
         simphonyMesh = Mesh(s_name)
-        uuids = []
         mmap = {}
-        meshsize = numerrin.meshsize(self.ph, name)
-        spoints = []
-        for i in range(meshsize[0]):
-            coord = numerrin.getnode(self.ph, name, i)
-            spoint = Point(coord, uid=generate_uuid())
-            spoints.append(spoint)
-            uuids.append(spoint.uid)
-            mmap[spoint.uid] = i
-
-        simphonyMesh.add(spoints)
-
-        if len(meshsize) > 1:
-            edges = []
-            for i in range(meshsize[1]):
-                plbl = numerrin.getelement(self.ph, name, 1, i, 0)
-                points = []
-                for pi in range(len(plbl)):
-                    points.append(uuids[plbl[pi]])
-                ed = Edge(points, uid=generate_uuid())
-                edges.append(ed)
-                mmap[ed.uid] = i
-            simphonyMesh.add(edges)
-
-        if len(meshsize) > 2:
-            labeluidmap = {}
-            faces = []
-            for i in range(meshsize[2]):
-                plbl = numerrin.getelement(self.ph, name, 2, i, 0)
-                points = []
-                for pi in range(len(plbl)):
-                    points.append(uuids[plbl[pi]])
-                face_renode(points)
-                fa = Face(points, uid=generate_uuid())
-                faces.append(fa)
-                mmap[fa.uid] = i
-                labeluidmap[i] = fa.uid
-            simphonyMesh.add(faces)
+        uuids = [generate_uuid() for _ in range(len(coordinates))]
+        simphonyMesh.add([Point(coord, uid=uid) for coord, uid in
+                          zip(coordinates.tolist(), uuids)])
+        mmap.update(zip(uuids, range(len(uuids))))
+
+        element_uuids = []
+        for element_class, elements in zip((Edge, Face, Cell),
+                                           connectivity):
+            uids = [generate_uuid() for _ in range(len(elements))]
+            simphonyMesh.add(
+                [element_class([uuids[lbl] for lbl in plbl if lbl >= 0],
+                               uid=uid)
+                 for plbl, uid in zip(elements.tolist(), uids)])
+            mmap.update(zip(uids, range(len(uids))))
+            element_uuids.append(uids)
+
+        face_uuids = element_uuids[1]
+        boundaries = {}
+        for boundary in boundary_faces:
+            boundaries[boundary] = [face_uuids[label] for label in
+                                    boundary_faces[boundary].tolist()]
 
-            boundaries = {}
+        return (simphonyMesh, mmap, boundaries)
+
+    def export_arrays(self, name, boundary_names=None):
+        """ export Numerrin mesh from pool as arrays
+
+        Parameters
+        ----------
+        name : str
+            name of mesh
+        boundary_names : list str, optional
+            list of boundary domain names
+
+        Return
+        ------
+        (coordinates, connectivity, element_types, boundary_faces) : tuple
+            (n_points, 3) array of node coordinates, list of edge,
+            face and cell connectivity arrays in SimPhoNy node order
+            with rows of elements with less nodes padded with -1,
+            list of edge, face and cell Numerrin element type arrays
+            and map from boundary name to array of face labels
+
+        """
+
+        coordinates = self.get_nodes(name)
+        connectivity = []
+        element_types = []
+        for level in (1, 2, 3):
+            elements, types = self.get_elements(name, level)
+            connectivity.append(elements)
+            element_types.append(types)
+
+        boundary_faces = {}
+        if boundary_names is not None:
             for boundary in boundary_names:
-                boundaries[boundary] = []
-                boundary_faces = numerrin.getelementnumbers(self.ph,
-                                                            name+boundary)
-                for boundary_face in boundary_faces:
-                    boundaries[boundary].append(
-                        labeluidmap[boundary_face])
-
-        if len(meshsize) > 3:
-            cells = []
-            for i in range(meshsize[3]):
-                plbl = numerrin.getelement(self.ph, name, 3, i, 0)
-                points = []
-                for pi in range(len(plbl)):
-                    points.append(uuids[plbl[pi]])
-                cell_renode(points)
-                ce = Cell(points, uid=generate_uuid())
-                cells.append(ce)
-                mmap[ce.uid] = i
-            simphonyMesh.add(cells)
+                boundary_faces[boundary] = numpy.array(
+                    numerrin.getelementnumbers(self.ph, name+boundary),
+                    dtype=int)
 
-        return (simphonyMesh, mmap, boundaries)
+        return (coordinates, connectivity, element_types, boundary_faces)
+
+    def iter_export(self, name, chunk_size=10000, namespace=None):
+        """ export Numerrin mesh from pool in chunks of SimPhoNy objects
+
+        Points, edges, faces and cells are read from the pool in label
+        ordered chunks, so that the whole mesh is never held in memory.
+        Uuids are derived from Numerrin labels, see DerivedUuidMap.
+
+        Parameters
+        ----------
+        name : str
+            name of mesh
+        chunk_size : int, optional
+            maximum number of items in a chunk
+        namespace : uuid.UUID, optional
+            namespace of derived uuids, by default a new one
+
+        Return
+        ------
+        chunks : iterator
+            iterator over (item_type, items) tuples, where item_type
+            is CUBA.POINT, CUBA.EDGE, CUBA.FACE or CUBA.CELL and items
+            a list of Point, Edge, Face or Cell objects
+
+        """
+
+        if namespace is None:
+            namespace = generate_uuid()
+        sizes = self.mesh_size(name)
+        maps = [DerivedUuidMap(namespace, level, count)
+                for level, count in enumerate(sizes)]
+
+        for start in range(0, sizes[0], chunk_size):
+            stop = min(start + chunk_size, sizes[0])
+            coordinates = self.get_nodes(name, start, stop)
+            yield (CUBA.POINT,
+                   [Point(coords, uid=uid) for coords, uid in
+                    zip(coordinates.tolist(),
+                        maps[0].uuids(range(start, stop)))])
+
+        levels = ((1, CUBA.EDGE, Edge), (2, CUBA.FACE, Face),
+                  (3, CUBA.CELL, Cell))
+        for level, item_type, element_class in levels:
+            if len(sizes) <= level:
+                continue
+            for start in range(0, sizes[level], chunk_size):
+                stop = min(start + chunk_size, sizes[level])
+                connectivity, _ = self.get_elements(name, level,
+                                                    start, stop)
+                yield (item_type,
+                       [element_class(
+                           maps[0].uuids([lbl for lbl in plbl if lbl >= 0]),
+                           uid=uid)
+                        for plbl, uid in
+                        zip(connectivity.tolist(),
+                            maps[level].uuids(range(start, stop)))])
 
     def import_mesh(self, name, simphonyMesh, boundaries):
         """ import SimPhoNy mesh to Numerrin pool as Numerrin mesh
@@ -124,107 +201,391 @@ class NumerrinPool(object):
         maps : list
             list of maps from SImPhoNy mesh low level objects
             uid's to corresponding Numerrin mesh objects
-            mmap : dictionary
+            mmap : UuidIndex
                 map from uuid to Numerrin label
-            pmap : dictionary
-                map from Numerrin point label to uuid
-            emap : dictionary
-                map from Numerrin edge label to uuid
-            fmap : dictionary
-                map from Numerrin face label to uuid
-            cmap : dictionary
-                map from Numerrin cell label to uuid
+            pmap : UuidArrayMap
+                map between Numerrin point labels and uuids
+            emap : UuidArrayMap or DerivedUuidMap
+                map between Numerrin edge labels and uuids
+            fmap : UuidArrayMap or DerivedUuidMap
+                map between Numerrin face labels and uuids
+            cmap : UuidArrayMap
+                map between Numerrin cell labels and uuids
 
         """
 
-        nPoints = simphonyMesh.count_of(CUBA.POINT)
-        nEdges = simphonyMesh.count_of(CUBA.EDGE)
-        nFaces = simphonyMesh.count_of(CUBA.FACE)
-        nCells = simphonyMesh.count_of(CUBA.CELL)
+        puids = []
+        coordinates = []
+        for point in simphonyMesh.iter(item_type=CUBA.POINT):
+            puids.append(point.uid)
+            coordinates.append(point.coordinates)
+        pmap = UuidArrayMap(puids)
 
-        sizes = (nPoints, nEdges, nFaces, nCells)
-        numerrin.initmesh(self.ph, name, 3, sizes)
+        emap, edges = self._element_map(
+            pmap, simphonyMesh.iter(item_type=CUBA.EDGE))
+        fmap, faces = self._element_map(
+            pmap, simphonyMesh.iter(item_type=CUBA.FACE))
+        cmap, cells = self._element_map(
+            pmap, simphonyMesh.iter(item_type=CUBA.CELL))
 
-        mmap = {}
-        pmap = {}
-        indx = 0
-        for point in simphonyMesh.iter(item_type=CUBA.POINT):
-            numerrin.setnode(self.ph, name, indx, point.coordinates)
-            mmap[point.uid] = indx
-            pmap[indx] = point.uid
-            indx += 1
-
-        indx = 0
-        emap = {}
-
-        for edge in simphonyMesh.iter(item_type=CUBA.EDGE):
-            pind = []
-            for point in edge.points:
-                pind.append(mmap[point])
-            numerrin.setelementtype(self.ph, name, 1, indx, 1)
-            numerrin.setelement(self.ph, name, 1, indx, 0, tuple(pind))
-            mmap[edge.uid] = indx
-            emap[indx] = edge.uid
-            indx += 1
-
-        indx = 0
-        fmap = {}
-        for face in simphonyMesh.iter(item_type=CUBA.FACE):
-            pind = []
-            for puid in face.points:
-                pind.append(mmap[puid])
-            face_renode(pind)
-            if len(pind) == 3:
-                numerrin.setelementtype(self.ph, name, 2, indx, 2)
-            else:
-                numerrin.setelementtype(self.ph, name, 2, indx, 3)
-            numerrin.setelement(self.ph, name, 2, indx, 0, tuple(pind))
-            mmap[face.uid] = indx
-            fmap[indx] = face.uid
-            indx += 1
+        boundary_faces = {}
+        for boundary in boundaries:
+            boundary_faces[boundary] =\
+                fmap.labels(boundaries[boundary]).tolist()
+
+        self._import_levels(name, coordinates, edges, faces, cells)
+
+        # uuids of edges and faces created by Numerrin are derived
+        # from the mesh namespace on demand
+        namespace = generate_uuid()
+        sizes = self.mesh_size(name)
+        if not len(edges):
+            emap = DerivedUuidMap(namespace, 1, sizes[1])
+        if not len(faces):
+            fmap = DerivedUuidMap(namespace, 2, sizes[2])
+        # add boundary domains
+        self.add_boundaries(name, boundaries, boundary_faces)
+
+        return [UuidIndex([pmap, emap, fmap, cmap]), pmap, emap, fmap, cmap]
+
+    def import_arrays(self, name, points, cells, cell_types=None,
+                      boundaries=None, faces=None, face_types=None):
+        """ import mesh given as arrays to Numerrin pool as Numerrin mesh
+
+        Parameters
+        ----------
+        name : str
+            name of mesh
+        points : array_like
+            (n_points, 3) array of point coordinates
+        cells : array_like
+            (n_cells, n_nodes) array of cell point labels in SimPhoNy
+            node order, rows of cells with less nodes padded with -1
+        cell_types : array_like, optional
+            Numerrin element types of cells, by default deduced from
+            the number of cell nodes
+        boundaries : dictionary, optional
+            map from boundary name to array of face labels (row
+            indices of faces)
+        faces : array_like, optional
+            (n_faces, n_nodes) array of face point labels in SimPhoNy
+            node order, rows of faces with less nodes padded with -1.
+            If not given, faces are created by Numerrin.
+        face_types : array_like, optional
+            Numerrin element types of faces, by default deduced from
+            the number of face nodes
+
+        Return
+        ------
+        maps : list
+            list of maps from uuids to Numerrin labels and from
+            Numerrin labels to uuids as returned by import_mesh
+
+        Raises
+        ------
+        ValueError
+            If boundaries are given without faces
+
+        """
+
+        if boundaries is None:
+            boundaries = {}
+        if boundaries and faces is None:
+            error_str = "Boundaries of mesh {} given without faces"
+            raise ValueError(error_str.format(name))
+
+        cells = numpy.asarray(cells, dtype=int)
+        if faces is None:
+            faces = connectivity_array([])
+        else:
+            faces = numpy.asarray(faces, dtype=int)
+
+        self._import_levels(name, points, connectivity_array([]), faces,
+                            cells, face_types, cell_types)
+
+        maps = self._derived_maps(name)
 
         boundary_faces = {}
         for boundary in boundaries:
-            boundary_faces[boundary] = []
-            for fuid in boundaries[boundary]:
-                boundary_faces[boundary].append(mmap[fuid])
-
-        indx = 0
-        cmap = {}
-        cell_ids = []
-        for cell in simphonyMesh.iter(item_type=CUBA.CELL):
-            pind = []
-            for point in cell.points:
-                pind.append(mmap[point])
-            cell_renode(pind)
-            if len(pind) == 4:
-                numerrin.setelementtype(self.ph, name, 3, indx, 4)
-            elif len(pind) == 6:
-                numerrin.setelementtype(self.ph, name, 3, indx, 6)
-            else:
-                numerrin.setelementtype(self.ph, name, 3, indx, 7)
-            numerrin.setelement(self.ph, name, 3, indx, 0, tuple(pind))
-            mmap[cell.uid] = indx
-            cmap[indx] = cell.uid
-            cell_ids.append(indx)
-            indx += 1
+            boundary_faces[boundary] =\
+                numpy.asarray(boundaries[boundary], dtype=int).tolist()
+        self.add_boundaries(name, boundaries, boundary_faces)
+
+        return maps
+
+    def adopt_mesh(self, name, boundary_names):
+        """ prepare a mesh created in Numerrin pool for use as it is
+
+        Parameters
+        ----------
+        name : str
+            name of mesh
+        boundary_names : list str
+            boundary names, boundary domains in pool are named
+            name+boundary
+
+        Return
+        ------
+        (maps, boundary_faces) : tuple
+            list of maps from uuids to Numerrin labels and from
+            Numerrin labels to uuids as returned by import_mesh and
+            map from boundary name to list of face labels
+
+        """
+
+        # create edges and faces if not exists, the mesh size is
+        # cached only after that
+        meshsize = numerrin.meshsize(self.ph, name)
+        if len(meshsize) < 2 or not meshsize[1]:
+            numerrin.createedges(self.ph, name)
+        if len(meshsize) < 3 or not meshsize[2]:
+            numerrin.createfaces(self.ph, name)
+        self._mesh_sizes.pop(name, None)
+        self.invalidate_metadata(name)
+        self._create_references(name)
+        self._registry.add(name)
+        boundary_faces = {}
+        for boundary in boundary_names:
+            boundary_faces[boundary] =\
+                list(numerrin.getelementnumbers(self.ph, name+boundary))
+            self._registry.add(name+boundary)
+        return (self._derived_maps(name), boundary_faces)
+
+    def _derived_maps(self, name):
+        """ uuid maps of a mesh with uuids derived from labels
+
+        Parameters
+        ----------
+        name : str
+            name of mesh
+
+        Return
+        ------
+        maps : list
+            list of maps from uuids to Numerrin labels and from
+            Numerrin labels to uuids as returned by import_mesh
+
+        """
+
+        # all uuids are derived from the mesh namespace on demand
+        namespace = generate_uuid()
+        maps = [DerivedUuidMap(namespace, level, count)
+                for level, count in enumerate(self.mesh_size(name))]
+        return [UuidIndex(maps)] + maps
+
+    def _element_map(self, pmap, elements):
+        """ uuid map and connectivity of SimPhoNy mesh elements
+
+        Parameters
+        ----------
+        pmap : UuidArrayMap
+            map between Numerrin point labels and uuids
+        elements : iterable of Edge, Face or Cell
+            elements of one mesh level
+
+        Return
+        ------
+        (map, connectivity) : tuple
+            map between element labels and uuids and connectivity
+            array of elements in SimPhoNy node order
+
+        """
+
+        uids = []
+        puids = []
+        counts = []
+        for element in elements:
+            uids.append(element.uid)
+            puids.extend(element.points)
+            counts.append(len(element.points))
+        return (UuidArrayMap(uids),
+                pack_connectivity(pmap.labels(puids), counts))
+
+    def _import_levels(self, name, coordinates, edges, faces, cells,
+                       face_types=None, cell_types=None):
+        """ create Numerrin mesh from node coordinates and connectivity
+
+        Edges and faces are created by Numerrin if not given.
+
+        Parameters
+        ----------
+        name : str
+            name of mesh
+        coordinates : array_like
+            (n_points, 3) array of node coordinates
+        edges, faces, cells : numpy.ndarray
+            connectivity arrays of mesh levels in SimPhoNy node order
+        face_types, cell_types : array_like, optional
+            Numerrin element types of faces and cells
+
+        """
+
+        sizes = (len(coordinates), len(edges), len(faces), len(cells))
+        numerrin.initmesh(self.ph, name, 3, sizes)
+        self._registry.add(name)
+        self.set_nodes(name, coordinates)
+        levels = ((1, edges, None), (2, faces, face_types),
+                  (3, cells, cell_types))
+        for level, connectivity, types in levels:
+            if types is None:
+                types = numerrin_element_types(
+                    level, (connectivity >= 0).sum(axis=1))
+            self.set_elements(name, level,
+                              renode_connectivity(connectivity, types),
+                              types)
 
         # create edges and faces if not exists
-        if not simphonyMesh.has_type(CUBA.EDGE):
+        if not len(edges):
             numerrin.createedges(self.ph, name)
-            # create mapping
-            for i in range(self.mesh_size(name)[1]):
-                points = []
-                edge = Edge(points, uid=generate_uuid())
-                emap[i] = edge.uid
-                mmap[edge.uid] = i
-        if not simphonyMesh.has_type(CUBA.FACE):
+        if not len(faces):
             numerrin.createfaces(self.ph, name)
-            # create mapping
-            for i in range(self.mesh_size(name)[2]):
-                uid = generate_uuid()
-                fmap[i] = uid
-                mmap[uid] = i
+        self._mesh_sizes.pop(name, None)
+        self.invalidate_metadata(name)
+        self._create_topology(name, len(cells))
+
+    def get_elements(self, name, level, start=0, stop=None, labels=None):
+        """ get connectivity and types of elements of a mesh level
+
+        Parameters
+        ----------
+        name : str
+            name of mesh
+        level : int
+            mesh level (1 edges, 2 faces, 3 cells)
+        start, stop : int, optional
+            label range of elements, default all elements
+        labels : array_like, optional
+            labels of elements, if given start and stop are ignored
+
+        Return
+        ------
+        (connectivity, types) : tuple
+            (n_elements, n_nodes) array of node labels in SimPhoNy
+            node order, rows of elements with less nodes padded with
+            -1, and array of Numerrin element types
+
+        """
+
+        ph = self.ph
+        if labels is None:
+            meshsize = self.mesh_size(name)
+            # mesh may not have all levels
+            count = meshsize[level] if len(meshsize) > level else 0
+            if stop is None:
+                stop = count
+            labels = range(start, min(stop, count))
+        else:
+            labels = numpy.asarray(labels, dtype=int).tolist()
+        elements = [numerrin.getelement(ph, name, level, label, 0)
+                    for label in labels]
+        connectivity = connectivity_array(elements)
+        types = numerrin_element_types(level,
+                                       (connectivity >= 0).sum(axis=1))
+        return (renode_connectivity(connectivity, types), types)
+
+    def set_nodes(self, name, coordinates):
+        """ set coordinates of all mesh nodes
+
+        Parameters
+        ----------
+        name : str
+            name of mesh
+        coordinates : array_like
+            (n_points, 3) array of node coordinates in label order
+
+        """
+
+        ph = self.ph
+        coordinates = numpy.asarray(coordinates, dtype=float)
+        for label, coords in enumerate(coordinates.tolist()):
+            numerrin.setnode(ph, name, label, tuple(coords))
+
+    def get_nodes(self, name, start=0, stop=None):
+        """ get coordinates of mesh nodes
+
+        Parameters
+        ----------
+        name : str
+            name of mesh
+        start, stop : int, optional
+            label range of nodes, default all nodes
+
+        Return
+        ------
+        coordinates : numpy.ndarray
+            (n_points, 3) array of node coordinates in label order
+
+        """
+
+        ph = self.ph
+        if stop is None:
+            stop = self.mesh_size(name)[0]
+        labels = range(start, stop)
+        return numpy.array([numerrin.getnode(ph, name, label)
+                            for label in labels],
+                           dtype=float).reshape(len(labels), 3)
+
+    def set_elements(self, name, level, connectivity, element_types=None):
+        """ set types and node references of all elements of a mesh level
+
+        Parameters
+        ----------
+        name : str
+            name of mesh
+        level : int
+            mesh level (1 edges, 2 faces, 3 cells)
+        connectivity : array_like
+            (n_elements, n_nodes) array of node labels in Numerrin node
+            order, rows of elements with less nodes padded with -1
+        element_types : array_like, optional
+            Numerrin element types, by default deduced from the
+            number of element nodes
+
+        """
+
+        connectivity = numpy.asarray(connectivity, dtype=int)
+        if connectivity.size == 0:
+            return
+        node_counts = (connectivity >= 0).sum(axis=1)
+        if element_types is None:
+            element_types = numerrin_element_types(level, node_counts)
+        ph = self.ph
+        for label, (etype, count, nodes) in enumerate(
+                zip(numpy.asarray(element_types).tolist(),
+                    node_counts.tolist(), connectivity.tolist())):
+            numerrin.setelementtype(ph, name, level, label, etype)
+            numerrin.setelement(ph, name, level, label, 0,
+                                tuple(nodes[:count]))
+
+    def _create_topology(self, name, cell_count):
+        """ create neighbor and reference lists and inner domain
+
+        Parameters
+        ----------
+        name : str
+            name of mesh
+        cell_count : int
+            number of cells in mesh
+
+        """
+
+        self._create_references(name)
+
+        # add inner domain
+        numerrin.createdomain(self.ph, "omega", name, 3,
+                              tuple(range(cell_count)))
+        self._registry.add("omega")
+
+    def _create_references(self, name):
+        """ create neighbor lists and references between mesh levels
+
+        Parameters
+        ----------
+        name : str
+            name of mesh
+
+        """
+
         # create neighbor lists
         numerrin.createneighbors(self.ph, name, 1)
         numerrin.createneighbors(self.ph, name, 2)
@@ -234,22 +595,83 @@ class NumerrinPool(object):
         numerrin.createrefs(self.ph, name, 3, 1)
         numerrin.createrefs(self.ph, name, 3, 2)
 
-        # add inner domain
-        numerrin.createdomain(self.ph, "omega", name, 3, tuple(cell_ids))
-        # add boundary domains
-        self.add_boundaries(name, boundaries, boundary_faces)
-
-        return [mmap, pmap, emap, fmap, cmap]
-
     def add_boundaries(self, name, boundaries, boundary_faces):
         for boundary_name in boundaries:
             numerrin.createboundary(self.ph, name+boundary_name, name,
                                     2, tuple(boundary_faces[boundary_name]))
+            self._registry.add(name+boundary_name)
 
     def clear(self):
         """ clear Numerrin pool
         """
         numerrin.clearpool(self.ph)
+        self._registry = set()
+        self._function_sizes = {}
+        self._stats_codes = {}
+        self._bc_variables = {}
+        self._mesh_sizes = {}
+        self.invalidate_metadata()
+
+    def invalidate_metadata(self, name=None):
+        """ clear cached variable types, ranks and sizes
+
+        Has to be called after Numerrin code has been executed on pool.
+        Cached mesh sizes are kept until the mesh is deleted.
+
+        Parameters
+        ----------
+        name : str, optional
+            name of changed variable, by default metadata of all
+            variables is cleared
+
+        """
+
+        if name is None:
+            self._metadata = {}
+        else:
+            self._metadata.pop(name, None)
+
+    def exists(self, name):
+        """ check if variable, space or domain is in pool
+
+        Names created through the pool are registered, other names
+        are probed once from Numerrin without transferring data.
+
+        Parameters
+        ----------
+        name : str
+            name of variable
+        Return
+        -----
+        exists : bool
+            True if name is in pool
+
+        """
+
+        if name not in self._registry:
+            try:
+                self.variable_type(name)
+            except RuntimeError:
+                return False
+            self._registry.add(name)
+        return True
+
+    def _cached_metadata(self, query, name):
+        """ cached result of a Numerrin metadata query on variable
+
+        Parameters
+        ----------
+        query : function
+            Numerrin query function taking pool handle and name
+        name : str
+            name of variable
+
+        """
+
+        metadata = self._metadata.setdefault(name, {})
+        if query.__name__ not in metadata:
+            metadata[query.__name__] = query(self.ph, name)
+        return metadata[query.__name__]
 
     def variable_type(self, name):
         """ get Numerrin variable type
@@ -264,7 +686,7 @@ class NumerrinPool(object):
             variable type
         """
 
-        return numerrin.gettype(self.ph, name)
+        return self._cached_metadata(numerrin.gettype, name)
 
     def variable_rank(self, name):
         """ get Numerrin variable rank
@@ -278,7 +700,7 @@ class NumerrinPool(object):
         rank : int
            variable rank
         """
-        return numerrin.getrank(self.ph, name)
+        return self._cached_metadata(numerrin.getrank, name)
 
     def variable_size(self, name):
         """ get Numerrin variable size
@@ -292,7 +714,7 @@ class NumerrinPool(object):
         size : int
            variable size
         """
-        return numerrin.getsize(self.ph, name)
+        return self._cached_metadata(numerrin.getsize, name)
 
     def get_variable(self, name):
         """ get Numerrin variable values
@@ -342,8 +764,12 @@ class NumerrinPool(object):
             for pari in par:
                 pool_name = ''.join(pari) + name
                 numerrin.putvariable(self.ph, pool_name, par[pari])
+                self._registry.add(pool_name)
+                self.invalidate_metadata(pool_name)
         else:
             numerrin.putvariable(self.ph, name, par)
+            self._registry.add(name)
+            self.invalidate_metadata(name)
 
     def put_variable(self, name, var):
         """ put variable to Numerrin pool
@@ -357,6 +783,25 @@ class NumerrinPool(object):
             tuples if vector valued variable
         """
         numerrin.putvariable(self.ph, name, var)
+        self._registry.add(name)
+        self.invalidate_metadata(name)
+
+    def put_bc_values(self, name, values):
+        """ put boundary condition values of a mesh to Numerrin pool
+
+        The variables are deleted with the mesh.
+
+        Parameters
+        ----------
+        name : str
+            name of mesh
+        values : dictionary
+            map from variable name to boundary condition value
+
+        """
+        for bc_name in values:
+            self.put_variable(bc_name, values[bc_name])
+        self._bc_variables.setdefault(name, set()).update(values)
 
     def create_space(self, name, domain_name, basis_name, basis_degree):
         """ create space to Numerrin pool
@@ -374,6 +819,8 @@ class NumerrinPool(object):
         """
         numerrin.createspace(self.ph, name, domain_name, basis_name,
                              basis_degree)
+        self._registry.add(name)
+        self.invalidate_metadata(name)
 
     def create_realfunction(self, name, space_name, function_size):
         """ create space to Numerrin pool
@@ -389,6 +836,82 @@ class NumerrinPool(object):
         """
 
         numerrin.createrealfunction(self.ph, name, space_name, function_size)
+        self._registry.add(name)
+        self._function_sizes[name] = function_size
+        self.invalidate_metadata(name)
+
+    def field_stats(self, name, size=None):
+        """ compute statistics of function values in pool
+
+        The statistics are computed by Numerrin code, which is parsed
+        once per function, so that only the results are transferred.
+
+        Parameters
+        ----------
+        name : str
+            name of function
+        size : int, optional
+            number of function components, by default the size the
+            function was created with or its size in pool
+
+        Return
+        ------
+        stats : dictionary
+            arrays of minimum, maximum, mean and L2 norm of function
+            values per component with keys 'min', 'max', 'mean'
+            and 'l2'
+
+        Raises
+        ------
+        ValueError
+            If the function is not in pool
+
+        """
+
+        if size is None:
+            size = self._function_size(name)
+        result_name = name + "Stats"
+        if name not in self._stats_codes or\
+                self._stats_codes[name][0] != size:
+            code = NumerrinCode(self.ph)
+            code.parse_string(field_stats_code(name, size, result_name))
+            self._stats_codes[name] = (size, code)
+        self._stats_codes[name][1].execute(1)
+        self.invalidate_metadata(result_name)
+
+        values = numpy.array(self.get_variable(result_name), dtype=float)
+        count = values[4*size]
+        values = values[:4*size].reshape(size, 4)
+        return {'min': values[:, 0],
+                'max': values[:, 1],
+                'mean': values[:, 2] / count,
+                'l2': values[:, 3]}
+
+    def _function_size(self, name):
+        """ number of components of a function in pool
+
+        Parameters
+        ----------
+        name : str
+            name of function
+
+        Return
+        ------
+        size : int
+            number of function components
+
+        """
+
+        if name in self._function_sizes:
+            return self._function_sizes[name]
+        if not self.exists(name):
+            error_str = "Trying to get statistics of a non-existing " +\
+                "function: {}"
+            raise ValueError(error_str.format(name))
+        # functions created by solver code
+        if self.variable_rank(name) == 0:
+            return 1
+        return int(numpy.prod(self.variable_size(name)))
 
     def modify_variable(self, name, var):
         """ modify variable values in pool
@@ -416,11 +939,23 @@ class NumerrinPool(object):
         for dkey in numvariables:
             dataName = numname[dkey]
             mDataName = name + dataName
-            try:
+            if self.exists(mDataName):
                 numerrin.clearvariable(self.ph, mDataName)
-            except RuntimeError:
-                pass
+                self._registry.discard(mDataName)
+                self.invalidate_metadata(mDataName)
         numerrin.clearvariable(self.ph, name)
+        self._registry.discard(name)
+        self._mesh_sizes.pop(name, None)
+        self.invalidate_metadata(name)
+        for dkey in numvariables:
+            mDataName = name + numname[dkey]
+            self._function_sizes.pop(mDataName, None)
+            self._stats_codes.pop(mDataName, None)
+        for bc_name in self._bc_variables.pop(name, ()):
+            if self.exists(bc_name):
+                numerrin.clearvariable(self.ph, bc_name)
+                self._registry.discard(bc_name)
+                self.invalidate_metadata(bc_name)
 
     def mesh_size(self, name):
         """ get Numerrin mesh size
@@ -434,7 +969,9 @@ class NumerrinPool(object):
         size : int tuple
            mesh size in different levels
         """
-        return numerrin.meshsize(self.ph, name)
+        if name not in self._mesh_sizes:
+            self._mesh_sizes[name] = numerrin.meshsize(self.ph, name)
+        return self._mesh_sizes[name]
 
     def get_edge_points(self, name, label):
         """ get mesh edge points from pool
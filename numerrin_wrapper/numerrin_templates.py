@@ -6,7 +6,6 @@ Templates for Numerrin solver -codes
 
 from simphony.core.cuba import CUBA
 from .cuba_extension import CUBAExt
-import re
 
 liccode =\
     """
@@ -612,16 +611,8 @@ def get_numerrin_solver(CM):
     return solver
 
 
-def to_numerrin_expression(expr):
-
-    if isinstance(expr, list) or isinstance(expr, tuple):
-        return_value = []
-        for value in expr:
-            return_value.append(to_numerrin_expression(value))
-        return return_value
-
-    return re.sub('(e|E)\+0', 'e+', re.sub('(e|E)\-0', 'e-',
-                                           '{:.5e}'.format(expr)))
+def bc_variable_name(domain, cuba):
+    return domain + numname[cuba] + "BC"
 
 
 def relative_velocity_code(SPExt):
@@ -678,3 +669,91 @@ def check_boundary_names(bc_names, boundary_names, cuba):
                              list(set(bc_names).difference(
                                  set(boundary_names))),
                              boundary_names))
+
+
+def boundary_integral_code(domain, expressions, result_names):
+    code = ""
+    for result_name in result_names:
+        code += result_name + "=0.0\n"
+    code += "Integral(" + domain + ",\"VlFlx1\",3)\n"
+    code += "nor:=NormalVector\n"
+    code += "vf:=VolumeFunction\n"
+    # vector reductions over integration points, only the results are
+    # assigned so that no other pool variables are changed
+    for expression, result_name in zip(expressions, result_names):
+        code += result_name + "+=Sum((" + expression + ")*vf)\n"
+    code += "EndIntegral\n"
+    return code
+
+
+def field_stats_code(name, size, result_name):
+    # vector reductions over function coefficients, results only are
+    # assigned so that no other pool variables are changed
+    code = ""
+    for c in range(size):
+        if size > 1:
+            component = name + "[" + str(c) + "][[:]]"
+        else:
+            component = name + "[[:]]"
+        r = [result_name + "[" + str(4*c + k) + "]" for k in range(4)]
+        code += r[0] + "=Min(" + component + ")\n"
+        code += r[1] + "=Max(" + component + ")\n"
+        code += r[2] + "=Sum(" + component + ")\n"
+        code += r[3] + "=Norm(" + component + ")\n"
+    code += result_name + "[" + str(4*size) + "]=Size(" + component + ")\n"
+    return code
+
+
+def condition_value(condition):
+    value = condition[1]
+    if hasattr(value, '__iter__'):
+        return tuple(float(v) for v in value)
+    return float(value)
+
+
+def boundary_groups(conditions, mesh_name, prefix):
+    # boundaries with equal condition type and value form one group,
+    # the domain of a single boundary group is the boundary itself,
+    # domain names are prefixed with the mesh name and numbered per
+    # condition type, so that they do not depend on the other types
+    keys = []
+    members = {}
+    for boundary in sorted(conditions):
+        condition = conditions[boundary]
+        if isinstance(condition, str):
+            key = condition
+        else:
+            key = (condition[0], condition_value(condition))
+        if key not in members:
+            keys.append(key)
+            members[key] = []
+        members[key].append(boundary)
+    groups = []
+    counts = {}
+    for key in keys:
+        boundaries = members[key]
+        condition_type = key if isinstance(key, str) else key[0]
+        if len(boundaries) == 1:
+            domain = mesh_name + boundaries[0]
+        else:
+            k = counts.get(condition_type, 0)
+            counts[condition_type] = k + 1
+            domain = mesh_name + prefix + condition_type[0].upper() +\
+                condition_type[1:] + "Group" + str(k)
+        groups.append((domain, conditions[boundaries[0]], boundaries))
+    return groups
+
+
+def union_code(domain, boundaries):
+    # pairwise union chain, names[i] is the union of boundaries[:i+1]
+    # and the last one is the domain
+    code = ""
+    names = [boundaries[0]]
+    for i in range(1, len(boundaries)):
+        if i == len(boundaries) - 1:
+            names.append(domain)
+        else:
+            names.append(domain + "U" + str(i))
+        code += names[i] + "=Union(" + names[i-1] + "," + boundaries[i] +\
+            ")\n"
+    return code, names
@@ -6,6 +6,28 @@ Utility functions
 
 import uuid
 
+import numpy
+
+# Numerrin element types by mesh level and number of element nodes
+element_types = {1: {2: 1},
+                 2: {3: 2, 4: 3},
+                 3: {4: 4, 6: 6, 8: 7}}
+
+# element type used for node counts missing from element_types
+default_element_types = {1: 1, 2: 3, 3: 7}
+
+# bit layout of derived uuids: the upper half of a mesh namespace uuid,
+# RFC 4122 variant bits, mesh level and Numerrin label
+_namespace_mask = ((1 << 64) - 1) << 64
+_variant_bits = 2 << 62
+_level_shift = 56
+_label_mask = (1 << _level_shift) - 1
+
+# node order permutations between SimPhoNy and Numerrin elements
+# by Numerrin element type (quadrilateral and hexahedron)
+renode_permutations = {3: (0, 1, 3, 2),
+                       7: (0, 1, 3, 2, 4, 5, 7, 6)}
+
 
 def face_renode(tab):
     """ renodes face nodes between SimPhoNy and Numerrin mesh
@@ -13,9 +35,7 @@ def face_renode(tab):
     """
 
     if len(tab) == 4:
-        tmp = tab[2]
-        tab[2] = tab[3]
-        tab[3] = tmp
+        tab[:] = [tab[i] for i in renode_permutations[3]]
     return tab
 
 
@@ -25,15 +45,42 @@ def cell_renode(tab):
     """
 
     if len(tab) == 8:
-        tmp = tab[2]
-        tab[2] = tab[3]
-        tab[3] = tmp
-        tmp = tab[6]
-        tab[6] = tab[7]
-        tab[7] = tmp
+        tab[:] = [tab[i] for i in renode_permutations[7]]
     return tab
 
 
+def renode_connectivity(connectivity, types):
+    """ renodes connectivity array between SimPhoNy and Numerrin mesh
+
+    Node columns of all elements of the same type are permuted at once.
+    As in face_renode and cell_renode, only elements with exactly as
+    many nodes as the permutation are renoded.
+
+    Parameters
+    ----------
+    connectivity : numpy.ndarray
+        (n_elements, n_nodes) array of node labels
+    types : numpy.ndarray
+        Numerrin element types of elements
+
+    Return
+    ------
+    connectivity : numpy.ndarray
+        renoded copy of connectivity
+
+    """
+
+    connectivity = numpy.array(connectivity, dtype=int)
+    types = numpy.asarray(types)
+    node_counts = (connectivity != -1).sum(axis=1)
+    for etype, permutation in renode_permutations.items():
+        rows = (types == etype) & (node_counts == len(permutation))
+        if rows.any():
+            connectivity[rows, :len(permutation)] =\
+                connectivity[rows][:, permutation]
+    return connectivity
+
+
 def generate_uuid():
     """Provides an uuid for the object
 
@@ -41,3 +88,348 @@ def generate_uuid():
     """
 
     return uuid.uuid4()
+
+
+def connectivity_array(elements):
+    """ pack element node labels to a connectivity array
+
+    Parameters
+    ----------
+    elements : list
+        list of node label sequences
+
+    Return
+    ------
+    connectivity : numpy.ndarray
+        (n_elements, n_nodes) integer array, rows of elements with
+        less nodes are padded with -1
+
+    """
+
+    labels = [label for nodes in elements for label in nodes]
+    counts = [len(nodes) for nodes in elements]
+    return pack_connectivity(labels, counts)
+
+
+def pack_connectivity(labels, counts):
+    """ pack consecutive element node labels to a connectivity array
+
+    Parameters
+    ----------
+    labels : array_like
+        node labels of all elements one element after another
+    counts : array_like
+        number of nodes of each element
+
+    Return
+    ------
+    connectivity : numpy.ndarray
+        (n_elements, n_nodes) integer array, rows of elements with
+        less nodes are padded with -1
+
+    """
+
+    counts = numpy.asarray(counts, dtype=int)
+    n_nodes = counts.max() if len(counts) else 0
+    connectivity = numpy.full((len(counts), n_nodes), -1, dtype=int)
+    connectivity[numpy.arange(n_nodes) < counts[:, None]] = labels
+    return connectivity
+
+
+def numerrin_element_types(level, node_counts):
+    """ Numerrin element types from element node counts
+
+    Parameters
+    ----------
+    level : int
+        mesh level (1 edges, 2 faces, 3 cells)
+    node_counts : numpy.ndarray
+        number of nodes of each element
+
+    Return
+    ------
+    types : numpy.ndarray
+        Numerrin element type of each element
+
+    """
+
+    node_counts = numpy.asarray(node_counts, dtype=int)
+    types = numpy.full(node_counts.shape, default_element_types[level],
+                       dtype=int)
+    for count, etype in element_types[level].items():
+        types[node_counts == count] = etype
+    return types
+
+
+def derived_uuid(namespace, level, label):
+    """ deterministic uuid of a Numerrin mesh entity
+
+    The uuid is composed of the upper half of the mesh namespace uuid,
+    the mesh level and the label, so that it can be recreated and
+    resolved back to the label without storing it.
+
+    Parameters
+    ----------
+    namespace : uuid.UUID
+        namespace uuid identifying the mesh
+    level : int
+        mesh level (0 points, 1 edges, 2 faces, 3 cells)
+    label : int
+        Numerrin label of entity
+
+    Return
+    ------
+    uid : uuid.UUID
+        uuid of entity
+
+    """
+
+    return uuid.UUID(int=_derived_prefix(namespace, level) | int(label))
+
+
+def derived_label(namespace, level, uid):
+    """ Numerrin label of an entity with a derived uuid
+
+    Parameters
+    ----------
+    namespace : uuid.UUID
+        namespace uuid identifying the mesh
+    level : int
+        mesh level (0 points, 1 edges, 2 faces, 3 cells)
+    uid : uuid.UUID
+        uuid of entity
+
+    Return
+    ------
+    label : int or None
+        Numerrin label, None if uid is not derived from namespace
+        for the mesh level
+
+    """
+
+    label = uid.int ^ _derived_prefix(namespace, level)
+    if label > _label_mask:
+        return None
+    return label
+
+
+def _derived_prefix(namespace, level):
+    return (namespace.int & _namespace_mask) | _variant_bits |\
+        (level << _level_shift)
+
+
+def uuid_array(uids):
+    """ pack uuids to an array of 128-bit (16 byte) values
+
+    Parameters
+    ----------
+    uids : iterable of uuid.UUID
+        uuids to pack
+
+    Return
+    ------
+    array : numpy.ndarray
+        array of big-endian uuid bytes, ordered as the uuids
+
+    """
+
+    return numpy.array([uid.bytes for uid in uids], dtype='S16')
+
+
+def _uuid_words(array):
+    """ (n, 2) array of upper and lower 64 bits of packed uuids
+
+    """
+
+    return numpy.ascontiguousarray(array).view('>u8').reshape(-1, 2)
+
+
+def _unpack_uuids(array):
+    return [uuid.UUID(int=(high << 64) | low)
+            for high, low in _uuid_words(array).tolist()]
+
+
+class UuidArrayMap(object):
+    """ Map between Numerrin labels and stored uuids of one mesh level
+
+    The uuids are kept in a 128-bit array indexed by label and the
+    reverse lookup is done by binary search over a sorted copy.
+
+    Parameters
+    ----------
+    uids : iterable of uuid.UUID
+        uuids of the entities in label order
+
+    """
+
+    def __init__(self, uids):
+        self._uuids = uuid_array(uids)
+        self._order = numpy.argsort(self._uuids, kind='mergesort')
+        self._sorted = self._uuids[self._order]
+
+    def __getitem__(self, label):
+        if not 0 <= label < len(self._uuids):
+            raise KeyError(label)
+        return _unpack_uuids(self._uuids[label:label+1])[0]
+
+    def __len__(self):
+        return len(self._uuids)
+
+    def uuids(self, labels):
+        """ uuids of labels
+
+        """
+
+        return _unpack_uuids(self._uuids[numpy.asarray(labels, dtype=int)])
+
+    def label(self, uid):
+        """ Numerrin label of uid
+
+        Raises
+        ------
+        KeyError
+            If uid is not in map
+
+        """
+
+        return int(self.labels([uid])[0])
+
+    def labels(self, uids):
+        """ Numerrin labels of uids as an integer array
+
+        Raises
+        ------
+        KeyError
+            If some of uids is not in map
+
+        """
+
+        keys = uuid_array(uids)
+        positions, found = self._find(keys)
+        if not found.all():
+            raise KeyError(_unpack_uuids(keys[~found])[0])
+        return self._order[positions]
+
+    def has_uuid(self, uid):
+        """ True if uid is in map
+
+        """
+
+        return bool(self._find(uuid_array([uid]))[1][0])
+
+    def _find(self, keys):
+        """ positions of keys in sorted uuids and mask of found keys
+
+        """
+
+        if not len(self._sorted):
+            return (numpy.zeros(len(keys), dtype=int),
+                    numpy.zeros(len(keys), dtype=bool))
+        positions = numpy.searchsorted(self._sorted, keys)
+        positions[positions == len(self._sorted)] = 0
+        return positions, self._sorted[positions] == keys
+
+
+class DerivedUuidMap(object):
+    """ Map from Numerrin labels to derived uuids of one mesh level
+
+    The uuids are created only when requested (see derived_uuid).
+
+    Parameters
+    ----------
+    namespace : uuid.UUID
+        namespace uuid identifying the mesh
+    level : int
+        mesh level (0 points, 1 edges, 2 faces, 3 cells)
+    count : int
+        number of entities in mesh level
+
+    """
+
+    def __init__(self, namespace, level, count):
+        self.namespace = namespace
+        self.level = level
+        self.count = count
+
+    def __getitem__(self, label):
+        if not 0 <= label < self.count:
+            raise KeyError(label)
+        return derived_uuid(self.namespace, self.level, label)
+
+    def __len__(self):
+        return self.count
+
+    def uuids(self, labels):
+        """ uuids of labels
+
+        """
+
+        prefix = _derived_prefix(self.namespace, self.level)
+        return [uuid.UUID(int=prefix | label)
+                for label in numpy.asarray(labels, dtype=int).tolist()]
+
+    def label(self, uid):
+        """ Numerrin label of uid
+
+        Raises
+        ------
+        KeyError
+            If uid is not in map
+
+        """
+
+        label = derived_label(self.namespace, self.level, uid)
+        if label is None or label >= self.count:
+            raise KeyError(uid)
+        return label
+
+    def labels(self, uids):
+        """ Numerrin labels of uids as an integer array
+
+        Raises
+        ------
+        KeyError
+            If some of uids is not in map
+
+        """
+
+        words = _uuid_words(uuid_array(uids))
+        prefix = _derived_prefix(self.namespace, self.level)
+        labels = words[:, 1] ^ numpy.uint64(prefix & ((1 << 64) - 1))
+        found = (words[:, 0] == numpy.uint64(prefix >> 64)) &\
+            (labels < numpy.uint64(self.count))
+        if not found.all():
+            raise KeyError(_unpack_uuids(words[~found].copy().view('S16'))[0])
+        return labels.astype(int)
+
+    def has_uuid(self, uid):
+        """ True if uid is in map
+
+        """
+
+        label = derived_label(self.namespace, self.level, uid)
+        return label is not None and label < self.count
+
+
+class UuidIndex(object):
+    """ Map from uuids of all mesh levels to Numerrin labels
+
+    Parameters
+    ----------
+    maps : list
+        label to uuid maps (UuidArrayMap or DerivedUuidMap) of
+        points, edges, faces and cells
+
+    """
+
+    def __init__(self, maps):
+        self.maps = maps
+
+    def __getitem__(self, uid):
+        for label_map in self.maps:
+            if label_map.has_uuid(uid):
+                return label_map.label(uid)
+        raise KeyError(uid)
+
+    def __contains__(self, uid):
+        return any(label_map.has_uuid(uid) for label_map in self.maps)
@@ -6,6 +6,7 @@ Wrapper module for Numerrin using native Numerrin-Python interface
 
 from simphony.cuds.abc_modeling_engine import ABCModelingEngine
 from simphony.core.data_container import DataContainer
+from simphony.core.cuba import CUBA
 
 from .numerrin_pool import NumerrinPool
 from .numerrin_code import NumerrinCode
@@ -26,6 +27,9 @@ class Wrapper(ABCModelingEngine):
         numerrin.initlocal("", "PYNUMERRIN_LICENSE", liccode)
         self.pool = NumerrinPool()
         self.code = NumerrinCode(self.pool.ph)
+        self._init_code = NumerrinCode(self.pool.ph)
+        self._copy_back_code = NumerrinCode(self.pool.ph)
+        self._copy_back_key = None
         self._meshes = {}
         self.CM = DataContainer()
         self.SP = DataContainer()
@@ -33,6 +37,8 @@ class Wrapper(ABCModelingEngine):
         self.CM_extensions = {}
         self.SP_extensions = {}
         self._first = True
+        # initialization code executed last
+        self._executed_init_code = None
 
     def run(self):
         """Run Numerrin based on CM, BC and SP data
@@ -43,64 +49,144 @@ class Wrapper(ABCModelingEngine):
 
         """
 
+        mesh = self._prepare()
+        self._execute_steps(mesh)
+        self.copy_back()
+
+    def advance(self, n_steps, copy_back=False):
+        """Advance the solution n_steps time steps
+
+        The solver variables are kept in Numerrin between the calls, so
+        the parsed code is reused and the time history of the solution
+        is continued. Point data changes made after the first call are
+        not copied to the solver variables.
+
+        Parameters
+        ----------
+        n_steps : int
+            number of time steps
+        copy_back : bool, optional
+            if True, the solution is copied to the point data
+
+        """
+
+        mesh = self._prepare()
+        self.pool.put_parameter(numname[CUBA.NUMBER_OF_TIME_STEPS],
+                                n_steps)
+        self._execute_steps(mesh)
+        if copy_back:
+            self.copy_back()
+
+    def copy_back(self):
+        """Copy the solution from solver variables to the point data
+
+        Point updates still buffered in the datasets are flushed to
+        the pool first, so that the copied solution is not overwritten
+        by them later. Buffered values of solver variables are thus
+        replaced by the solution, other point data is kept.
+
+        """
+
+        # write buffered point updates to pool
+        for dataset in self.iter_datasets():
+            dataset.flush()
+        # assume that only one dataset
+        mesh = self.iter_datasets().next()
+        key = (mesh.name, get_numerrin_solver(self.CM_extensions))
+        if key != self._copy_back_key:
+            self._copy_back_code.clear()
+            self._copy_back_code.parse_string(
+                self._copy_back_code.generate_copy_back_code(
+                    self.CM, self.CM_extensions))
+            self._copy_back_key = key
+        self._copy_back_code.execute(self._number_of_cores())
+        # point values in pool changed
+        for dataset in self.iter_datasets():
+            dataset.clear_field_cache()
+
+    def _prepare(self):
+        """Put settings to pool and initialize solver variables
+
+        Return
+        ------
+        mesh : NumerrinMesh
+            mesh to be solved
+
+        """
+
         # assume that only one dataset
         mesh = self.iter_datasets().next()
 
+        # write buffered point updates to pool
+        for dataset in self.iter_datasets():
+            dataset.flush()
         # put SP parameters to pool
         for key in self.SP:
             self.pool.put_parameter(numname[key], self.SP[key])
         for key in self.SP_extensions:
             self.pool.put_parameter(numname[key], self.SP_extensions[key])
+        # put boundary condition values to pool
+        self.pool.put_bc_values(mesh.name,
+                                self.code.generate_bc_values(self.CM,
+                                                             self.BC))
         # init variables to pool if not initialized
         mesh.init_point_variables(get_numerrin_solver(self.CM_extensions))
-        # parse solver code
-        if self._first:
-            f = open('code.num', 'w')
-            f.write(self.code.generate_init_code(self.CM,
-                                                 self.SP,
-                                                 self.SP_extensions,
-                                                 self.BC,
-                                                 self.CM_extensions) +
-                    self.code.generate_code(self.CM,
-                                            self.SP,
-                                            self.SP_extensions,
-                                            self.BC,
-                                            self.CM_extensions,
-                                            mesh))
-            f.close()
-            # initialize time
-            self.pool.put_variable('curTime', 0.0)
-            self.code.parse_string(
-                self.code.generate_init_code(self.CM,
-                                             self.SP,
-                                             self.SP_extensions,
-                                             self.BC,
-                                             self.CM_extensions) +
-                self.code.generate_code(self.CM,
-                                        self.SP,
-                                        self.SP_extensions,
-                                        self.BC,
-                                        self.CM_extensions,
-                                        mesh))
+        # define solver variables from point values once, and again
+        # if the domains and spaces (e.g. zero normal velocity groups)
+        # defined in initialization code change
+        init_code = self._init_code.generate_init_code(self.CM,
+                                                       self.SP,
+                                                       self.SP_extensions,
+                                                       self.BC,
+                                                       self.CM_extensions)
+        code_file = self.CM_extensions.get(CUBAExt.DEBUG_CODE_FILE)
+        if code_file is not None:
+            with open(code_file + ".init", 'w') as f:
+                f.write(init_code)
+        if self._first or init_code != self._executed_init_code:
+            if self._first:
+                # initialize time
+                self.pool.put_variable('curTime', 0.0)
+            self._init_code.parse_string(init_code)
+            self._init_code.execute(self._number_of_cores())
+            self._init_code.clear()
+            self._executed_init_code = init_code
             self._first = False
-        else:
-            self.code.clear()
-            self.code.parse_string(
-                self.code.generate_code(self.CM,
-                                        self.SP,
-                                        self.SP_extensions,
-                                        self.BC,
-                                        self.CM_extensions,
-                                        mesh))
+        return mesh
+
+    def _execute_steps(self, mesh):
+        """Execute NumberOfTimeSteps time steps
 
+        Parameters
+        ----------
+        mesh : NumerrinMesh
+            mesh to be solved
+
+        """
+
+        # parse time stepping code, generated code is reused if the
+        # settings have not changed
+        code_file = self.CM_extensions.get(CUBAExt.DEBUG_CODE_FILE)
+        self.code.parse_cached_code(self.CM,
+                                    self.SP,
+                                    self.SP_extensions,
+                                    self.BC,
+                                    self.CM_extensions,
+                                    mesh, copy_back=False,
+                                    code_file=code_file)
         # execute code
-        number_of_cores = 1
-        if CUBAExt.NUMBER_OF_CORES in self.CM_extensions:
-            number_of_cores = self.CM_extensions[CUBAExt.NUMBER_OF_CORES]
-        self.code.execute(number_of_cores)
+        self.code.execute(self._number_of_cores())
+        # variables in pool changed
+        self.pool.invalidate_metadata()
         # save time
         mesh._time = self.pool.get_variable('curTime')
 
+    def _number_of_cores(self):
+        """ number of cores used in execution """
+        if CUBAExt.NUMBER_OF_CORES in self.CM_extensions:
+            return self.CM_extensions[CUBAExt.NUMBER_OF_CORES]
+        return 1
+
     def add_dataset(self, mesh):
         """Add a mesh to the Numerrin modeling engine.
 
@@ -128,6 +214,85 @@ class Wrapper(ABCModelingEngine):
         self._meshes[mesh.name] = NumerrinMesh(mesh.name, mesh, self.pool)
         return self._meshes[mesh.name]
 
+    def add_dataset_from_arrays(self, name, points, cells, cell_types=None,
+                                boundaries=None, faces=None,
+                                face_types=None):
+        """Add a mesh given as arrays to the Numerrin modeling engine.
+
+        Parameters
+        ----------
+        name : str
+            name of the mesh
+        points : array_like
+            (n_points, 3) array of point coordinates
+        cells : array_like
+            (n_cells, n_nodes) array of cell point labels in SimPhoNy
+            node order, rows of cells with less nodes padded with -1
+        cell_types : array_like, optional
+            Numerrin element types of cells
+        boundaries : dictionary, optional
+            map from boundary name to array of face labels
+        faces : array_like, optional
+            (n_faces, n_nodes) array of face point labels in SimPhoNy
+            node order. Required if boundaries are given.
+        face_types : array_like, optional
+            Numerrin element types of faces
+
+        Returns
+        -------
+        proxy : NumerrinMesh
+            A proxy mesh to be used to update/query the internal representation
+            stored inside the modeling-engine. See get_mesh for more
+            information.
+
+        Raises
+        ------
+        Exception if mesh already exists
+
+        """
+
+        if name in self._meshes:
+            raise ValueError('Mesh \'{}\' already exists'.format(name))
+
+        self._meshes[name] = NumerrinMesh.from_arrays(name, self.pool,
+                                                      points, cells,
+                                                      cell_types,
+                                                      boundaries, faces,
+                                                      face_types)
+        return self._meshes[name]
+
+    def add_dataset_from_pool(self, name, boundary_names):
+        """Add a mesh created in Numerrin pool to the Numerrin modeling
+        engine.
+
+        Parameters
+        ----------
+        name : str
+            name of the mesh in pool
+        boundary_names : list str
+            boundary names, boundary domains in pool are named
+            name+boundary
+
+        Returns
+        -------
+        proxy : NumerrinMesh
+            A proxy mesh to be used to update/query the internal representation
+            stored inside the modeling-engine. See get_mesh for more
+            information.
+
+        Raises
+        ------
+        Exception if mesh already exists
+
+        """
+
+        if name in self._meshes:
+            raise ValueError('Mesh \'{}\' already exists'.format(name))
+
+        self._meshes[name] = NumerrinMesh.from_pool(name, self.pool,
+                                                    boundary_names)
+        return self._meshes[name]
+
     def get_dataset(self, name):
         """Get a mesh.
 
@@ -7,6 +7,9 @@ numerrin_code module functionalities
 
 import unittest
 import os
+import re
+import shutil
+import tempfile
 import textwrap
 
 from simphony.core.cuba import CUBA
@@ -129,6 +132,9 @@ class NumerrinCodeTestCase(unittest.TestCase):
 
         for key in SP:
             self.pool.put_variable(numname[key], SP[key])
+        bc_values = self.code.generate_bc_values(CM, BC)
+        for bc_name in bc_values:
+            self.pool.put_variable(bc_name, bc_values[bc_name])
 
         nummesh.init_point_variables(get_numerrin_solver(CMExt))
 
@@ -144,6 +150,251 @@ class NumerrinCodeTestCase(unittest.TestCase):
         self.assertEqual(self.pool.variable_type(numname[CUBA.DENSITY]),
                          "Real")
 
+    def test_generate_bc_values(self):
+        """Test generate_bc_values method
+
+        """
+        CM = DataContainer()
+        BC = DataContainer()
+        CM[CUBA.NAME] = 'mesh'
+        BC[CUBA.VELOCITY] = {'inlet': ('fixedValue', (0.1, 0, 0)),
+                             'walls': 'zeroGradient'}
+        BC[CUBA.PRESSURE] = {'inlet': 'zeroGradient',
+                             'walls': ('fixedValue', 0)}
+        self.assertEqual(self.code.generate_bc_values(CM, BC),
+                         {'meshinletVelocityBC': (0.1, 0.0, 0.0),
+                          'meshwallsPressureBC': 0.0})
+
+    def _cube_mesh(self, boundaries=None):
+        points = [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (1.0, 1.0, 0.0),
+                  (0.0, 1.0, 0.0), (0.0, 0.0, 1.0), (1.0, 0.0, 1.0),
+                  (1.0, 1.0, 1.0), (0.0, 1.0, 1.0)]
+        faces = [[0, 3, 7, 4], [1, 2, 6, 5], [0, 1, 5, 4],
+                 [3, 2, 6, 7], [0, 1, 2, 3], [4, 5, 6, 7]]
+        if boundaries is None:
+            boundaries = {'left': [0], 'right': [1], 'front': [2],
+                          'back': [3], 'bottom': [4], 'top': [5]}
+        return NumerrinMesh.from_arrays('cube', self.pool, points,
+                                        [range(8)],
+                                        boundaries=boundaries,
+                                        faces=faces)
+
+    def test_generate_code_boundary_groups(self):
+        """Test that boundaries with equal conditions are grouped
+
+        """
+        CM = DataContainer()
+        SP = DataContainer()
+        BC = DataContainer()
+        CMExt = {}
+        CM[CUBA.NAME] = 'cube'
+        CMExt[CUBAExt.GE] = (CUBAExt.INCOMPRESSIBLE,
+                             CUBAExt.LAMINAR_MODEL)
+        BC[CUBA.VELOCITY] = {'left': ('fixedValue', (0, 0, 0)),
+                             'right': ('fixedValue', (0, 0, 0)),
+                             'front': 'slip',
+                             'back': 'slip',
+                             'top': ('fixedValue', (1, 0, 0)),
+                             'bottom': 'zeroGradient'}
+        BC[CUBA.PRESSURE] = {'left': 'zeroGradient',
+                             'right': 'zeroGradient',
+                             'front': 'zeroGradient',
+                             'back': 'zeroGradient',
+                             'top': 'zeroGradient',
+                             'bottom': ('fixedValue', 0)}
+        mesh = self._cube_mesh()
+
+        init_code = self.code.generate_init_code(CM, SP, {}, BC, CMExt)
+        self.assertEqual(init_code.count("=Space(cubeVelocitySlipGroup0"),
+                         1)
+        self.assertIn("cubeVelocitySlipGroup0=Union(cubeback,cubefront)",
+                      init_code)
+        self.assertEqual(init_code.count("Eliminate("), 1)
+        code = self.code.generate_code(CM, SP, {}, BC, CMExt, mesh)
+        self.assertIn("=Union(", code)
+        self.assertNotIn("(Boundaries,", code)
+        # velocity constraints of two groups
+        self.assertEqual(code.count(",V)\n"), 2)
+        self.assertEqual(code.count("Integral(cubeBoundaries,\"VlFlx1\""),
+                         1)
+        self.assertEqual(sorted(self.code.generate_bc_values(CM, BC)),
+                         sorted(['cubeVelocityFixedValueGroup0VelocityBC',
+                                 'cubetopVelocityBC',
+                                 'cubebottomPressureBC']))
+
+    def test_generate_code_slip_names(self):
+        """Test that slip groups do not depend on other boundary values
+
+        """
+        CM = DataContainer()
+        SP = DataContainer()
+        BC = DataContainer()
+        CMExt = {}
+        CM[CUBA.NAME] = 'cube'
+        CMExt[CUBAExt.GE] = (CUBAExt.INCOMPRESSIBLE,
+                             CUBAExt.LAMINAR_MODEL)
+        BC[CUBA.VELOCITY] = {'left': ('fixedValue', (1, 0, 0)),
+                             'right': 'zeroGradient',
+                             'front': 'slip',
+                             'back': 'slip',
+                             'top': ('fixedValue', (0, 0, 0)),
+                             'bottom': ('fixedValue', (0, 0, 0))}
+        BC[CUBA.PRESSURE] = {'left': 'zeroGradient',
+                             'right': ('fixedValue', 0),
+                             'front': 'zeroGradient',
+                             'back': 'zeroGradient',
+                             'top': 'zeroGradient',
+                             'bottom': 'zeroGradient'}
+        mesh = self._cube_mesh()
+
+        init_code = self.code.generate_init_code(CM, SP, {}, BC, CMExt)
+        code = self.code.generate_code(CM, SP, {}, BC, CMExt, mesh)
+        self.assertEqual(set(re.findall(r"lambda\w+\(", code)),
+                         set(["lambdacubeVelocitySlipGroup0("]))
+        # inlet value changed and equal to the walls
+        for value in [(2, 0, 0), (0, 0, 0)]:
+            BC[CUBA.VELOCITY]['left'] = ('fixedValue', value)
+            self.assertEqual(
+                self.code.generate_init_code(CM, SP, {}, BC, CMExt),
+                init_code)
+            code = self.code.generate_code(CM, SP, {}, BC, CMExt, mesh)
+            self.assertEqual(set(re.findall(r"lambda\w+\(", code)),
+                             set(["lambdacubeVelocitySlipGroup0("]))
+
+    def test_generate_code_optimized(self):
+        """Test that generated integrals are merged and evaluations hoisted
+
+        """
+        CM = DataContainer()
+        SP = DataContainer()
+        BC = DataContainer()
+        CMExt = {}
+        CM[CUBA.NAME] = 'cube'
+        CMExt[CUBAExt.GE] = (CUBAExt.INCOMPRESSIBLE,
+                             CUBAExt.LAMINAR_MODEL)
+        BC[CUBA.VELOCITY] = {'left': ('fixedValue', (0, 0, 0)),
+                             'right': 'slip',
+                             'front': 'zeroGradient',
+                             'back': 'zeroGradient',
+                             'top': 'zeroGradient',
+                             'bottom': 'zeroGradient'}
+        BC[CUBA.PRESSURE] = {'left': 'zeroGradient',
+                             'right': 'zeroGradient',
+                             'front': 'zeroGradient',
+                             'back': 'zeroGradient',
+                             'top': 'zeroGradient',
+                             'bottom': ('fixedValue', 0)}
+        mesh = self._cube_mesh()
+
+        code = self.code.generate_code(CM, SP, {}, BC, CMExt, mesh)
+        lines = [line.strip() for line in code.split("\n")]
+        # the two Lobatto integrals of the slip boundary are merged,
+        # the Lagrange multiplier is evaluated once
+        start = lines.index("Integral(cuberight,\"Lobatto\",2)")
+        end = lines.index("EndIntegral", start)
+        self.assertEqual(code.count("Integral(cuberight,\"Lobatto\",2)"), 1)
+        self.assertEqual(lines[start + 1],
+                         "lambdacuberightEval:=lambdacuberight(.)")
+        self.assertEqual(lines[start + 1:end].count("nor:=NormalVector"), 1)
+        self.assertIn("r[4] <- (u(.) dot nor)*" +
+                      "BasisFunction(Zcuberight(.))", lines[start:end])
+        # momentum flux evaluates velocity and pressure once, the
+        # gradient argument is left as it is
+        start = lines.index("Integral(omega,\"VlFlx2\",3)")
+        end = lines.index("EndIntegral", start)
+        self.assertEqual(lines[start + 1:start + 3],
+                         ["uEval:=u(.)", "pEval:=p(.)"])
+        self.assertIn("gup=Grad(u(.))", lines[start:end])
+        # outflow momentum is evaluated before the If, not moved out of
+        # it
+        start = lines.index("Integral(cubebottom,\"VlFlx2\",1)")
+        end = lines.index("EndIntegral", start)
+        self.assertEqual(lines[start + 1], "uEval:=u(.)")
+        self.assertIn("If uEval dot nor > 0.0", lines[start:end])
+        self.assertIn("r[0] <- Density*u[0](.)*uEval dot nor*vf",
+                      lines[start:end])
+
+    def test_parse_cached_code(self):
+        """Test generate_cached_code and parse_cached_code methods
+
+        """
+        CM = DataContainer()
+        SP = DataContainer()
+        BC = DataContainer()
+        CMExt = {}
+        CM[CUBA.NAME] = 'cube'
+        CMExt[CUBAExt.GE] = (CUBAExt.INCOMPRESSIBLE,
+                             CUBAExt.LAMINAR_MODEL)
+        BC[CUBA.VELOCITY] = {'inlet': ('fixedValue', (0.1, 0, 0)),
+                             'walls': 'zeroGradient'}
+        BC[CUBA.PRESSURE] = {'inlet': 'zeroGradient',
+                             'walls': ('fixedValue', 0)}
+        mesh = self._cube_mesh({'inlet': [0], 'walls': [1, 2, 3, 4, 5]})
+
+        code = self.code.generate_cached_code(CM, SP, {}, BC, CMExt, mesh)
+        self.assertEqual(code,
+                         self.code.generate_code(CM, SP, {}, BC, CMExt,
+                                                 mesh))
+        self.assertEqual(code,
+                         self.code.generate_step_code(CM, SP, {}, BC, CMExt,
+                                                      mesh) +
+                         self.code.generate_copy_back_code(CM, CMExt))
+        self.assertIs(code,
+                      self.code.generate_cached_code(CM, SP, {}, BC, CMExt,
+                                                     mesh))
+        self.assertEqual(self.code.generate_cached_code(CM, SP, {}, BC,
+                                                        CMExt, mesh,
+                                                        copy_back=False),
+                         self.code.generate_step_code(CM, SP, {}, BC, CMExt,
+                                                      mesh))
+        self.assertTrue(self.code.parse_cached_code(CM, SP, {}, BC, CMExt,
+                                                    mesh))
+        self.assertFalse(self.code.parse_cached_code(CM, SP, {}, BC, CMExt,
+                                                     mesh))
+        BC[CUBA.VELOCITY] = {'inlet': ('fixedValue', (0.2, 0, 0)),
+                             'walls': 'zeroGradient'}
+        self.assertFalse(self.code.parse_cached_code(CM, SP, {}, BC, CMExt,
+                                                     mesh))
+        BC[CUBA.VELOCITY] = {'inlet': 'zeroGradient',
+                             'walls': ('fixedValue', (0, 0, 0))}
+        self.assertTrue(self.code.parse_cached_code(CM, SP, {}, BC, CMExt,
+                                                    mesh))
+        self.code.clear()
+        self.assertTrue(self.code.parse_cached_code(CM, SP, {}, BC, CMExt,
+                                                    mesh))
+        CMExt[CUBAExt.NUMBER_OF_CORES] = 2
+        self.assertFalse(self.code.parse_cached_code(CM, SP, {}, BC, CMExt,
+                                                     mesh))
+
+    def test_parse_cached_code_file(self):
+        """Test that parse_cached_code writes the parsed code to file
+
+        """
+        CM = DataContainer()
+        SP = DataContainer()
+        BC = DataContainer()
+        CMExt = {}
+        CM[CUBA.NAME] = 'cube'
+        CMExt[CUBAExt.GE] = (CUBAExt.INCOMPRESSIBLE,
+                             CUBAExt.LAMINAR_MODEL)
+        BC[CUBA.VELOCITY] = {'walls': 'zeroGradient'}
+        BC[CUBA.PRESSURE] = {'walls': ('fixedValue', 0)}
+        mesh = self._cube_mesh({'walls': range(6)})
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        codefile = os.path.join(temp_dir, 'code.num')
+        self.assertTrue(self.code.parse_cached_code(CM, SP, {}, BC, CMExt,
+                                                    mesh))
+        # the file is written also when the parsed code is reused
+        self.assertFalse(self.code.parse_cached_code(CM, SP, {}, BC, CMExt,
+                                                     mesh,
+                                                     code_file=codefile))
+        with open(codefile) as f:
+            code = f.read()
+        self.assertEqual(code,
+                         self.code.generate_cached_code(CM, SP, {}, BC,
+                                                        CMExt, mesh))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,168 @@
+""" test_numerrin_ir module
+
+This module contains the unitary tests for the
+numerrin_ir module functionalities
+
+"""
+
+import unittest
+
+from numerrin_wrapper.numerrin_ir import (CodeBlock, parse_code, write_code,
+                                          merge_integrals, hoist_evaluations,
+                                          optimize_code)
+from numerrin_wrapper.numerrin_templates import solverFrames
+
+
+class NumerrinIRTestCase(unittest.TestCase):
+    """Test case for numerrin_ir functions"""
+
+    def test_parse_code(self):
+        """Test parse_code and write_code functions
+
+        """
+
+        code = "a=1.0\n" +\
+            "  Integral(walls,\"VlFlx1\",3)\n" +\
+            "    r[3] <- u(.)*vf\n" +\
+            "  EndIntegral\n" +\
+            "Constraint(inlet,V)\n" +\
+            " r[0] <- u[0](.)\n" +\
+            "EndConstraint\n"
+        items = parse_code(code)
+        blocks = [item for item in items if isinstance(item, CodeBlock)]
+        self.assertEqual([block.kind for block in blocks],
+                         ["Integral", "Constraint"])
+        self.assertEqual(blocks[0].arguments, "walls,\"VlFlx1\",3")
+        self.assertEqual(blocks[1].statements, [" r[0] <- u[0](.)"])
+        self.assertEqual(write_code(items), code)
+        for frame in solverFrames.values():
+            self.assertEqual(write_code(parse_code(frame)), frame)
+
+    def test_merge_integrals(self):
+        """Test merge_integrals function
+
+        """
+
+        code = "Integral(fb,\"Lobatto\",2)\n" +\
+            "nor:=NormalVector\n" +\
+            "r[0] <- lambdafb(.)*nor[0]\n" +\
+            "EndIntegral\n" +\
+            "\n" +\
+            "Integral(fb,\"Lobatto\",2)\n" +\
+            "nor:=NormalVector\n" +\
+            "r[4] <- u(.) dot nor\n" +\
+            "EndIntegral\n" +\
+            "Integral(fb,\"Lobatto\",2)\n" +\
+            "nor:=-NormalVector\n" +\
+            "r[5] <- u(.) dot nor\n" +\
+            "EndIntegral\n"
+        items = merge_integrals(parse_code(code))
+        blocks = [item for item in items if isinstance(item, CodeBlock)]
+        self.assertEqual(len(blocks), 2)
+        self.assertEqual(blocks[0].statements,
+                         ["nor:=NormalVector",
+                          "r[0] <- lambdafb(.)*nor[0]",
+                          "r[4] <- u(.) dot nor"])
+
+        # redefined locals are not merged even if the definitions
+        # match pairwise
+        code = "Integral(fb,\"Lobatto\",2)\n" +\
+            "x:=a\n" +\
+            "r[0] <- x\n" +\
+            "x:=b\n" +\
+            "r[1] <- x\n" +\
+            "EndIntegral\n" +\
+            "Integral(fb,\"Lobatto\",2)\n" +\
+            "x:=a\n" +\
+            "r[2] <- x\n" +\
+            "x:=b\n" +\
+            "EndIntegral\n"
+        items = merge_integrals(parse_code(code))
+        blocks = [item for item in items if isinstance(item, CodeBlock)]
+        self.assertEqual(len(blocks), 2)
+
+        # definitions inside branches are not merged
+        code = "Integral(fb,\"Lobatto\",2)\n" +\
+            "If a > 0.0\n" +\
+            "x:=a\n" +\
+            "EndIf\n" +\
+            "r[0] <- a\n" +\
+            "EndIntegral\n" +\
+            "Integral(fb,\"Lobatto\",2)\n" +\
+            "If a > 0.0\n" +\
+            "x:=a\n" +\
+            "EndIf\n" +\
+            "r[1] <- a\n" +\
+            "EndIntegral\n"
+        items = merge_integrals(parse_code(code))
+        blocks = [item for item in items if isinstance(item, CodeBlock)]
+        self.assertEqual(len(blocks), 2)
+
+    def test_hoist_evaluations(self):
+        """Test hoist_evaluations function
+
+        """
+
+        block = parse_code("Integral(out,\"VlFlx2\",1)\n" +
+                           "  gup=Grad(u(.))\n" +
+                           "  If u(.) dot nor > 0.0\n" +
+                           "  r[0] <- u[0](.)*u(.) dot nor\n" +
+                           "  r[1] <- u[1](.)*u(.) dot nor\n" +
+                           "  r[3] <- p(.)\n" +
+                           "  EndIf\n" +
+                           "EndIntegral")[0]
+        hoist_evaluations(block)
+        self.assertEqual(block.statements,
+                         ["  uEval:=u(.)",
+                          "  gup=Grad(u(.))",
+                          "  If uEval dot nor > 0.0",
+                          "  r[0] <- u[0](.)*uEval dot nor",
+                          "  r[1] <- u[1](.)*uEval dot nor",
+                          "  r[3] <- p(.)",
+                          "  EndIf"])
+
+        # evaluations only inside a branch stay there
+        block = parse_code("Integral(out,\"VlFlx2\",1)\n" +
+                           "If a > 0.0\n" +
+                           "r[0] <- p(.)\n" +
+                           "r[1] <- p(.)\n" +
+                           "EndIf\n" +
+                           "EndIntegral")[0]
+        hoist_evaluations(block)
+        self.assertEqual(block.statements,
+                         ["If a > 0.0", "r[0] <- p(.)", "r[1] <- p(.)",
+                          "EndIf"])
+
+        block = parse_code("Integral(out,\"VlFlx2\",1)\n" +
+                           "phi=BasisFunction(V)\n" +
+                           "r[0] <- phi(.)*phi(.)\n" +
+                           "EndIntegral")[0]
+        hoist_evaluations(block)
+        self.assertEqual(block.statements,
+                         ["phi=BasisFunction(V)", "r[0] <- phi(.)*phi(.)"])
+
+    def test_optimize_code(self):
+        """Test optimize_code function
+
+        """
+
+        code = "Integral(fb,\"Lobatto\",2)\n" +\
+            "nor:=NormalVector\n" +\
+            "r[0] <- lambdafb(.)*nor[0]\n" +\
+            "EndIntegral\n" +\
+            "Integral(fb,\"Lobatto\",2)\n" +\
+            "nor:=NormalVector\n" +\
+            "r[1] <- lambdafb(.)*nor[1]\n" +\
+            "EndIntegral\n"
+        self.assertEqual(optimize_code(code),
+                         "Integral(fb,\"Lobatto\",2)\n" +
+                         "lambdafbEval:=lambdafb(.)\n" +
+                         "nor:=NormalVector\n" +
+                         "r[0] <- lambdafbEval*nor[0]\n" +
+                         "r[1] <- lambdafbEval*nor[1]\n" +
+                         "EndIntegral\n")
+        self.assertEqual(optimize_code("a=1.0\n"), "a=1.0\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
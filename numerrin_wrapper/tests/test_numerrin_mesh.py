@@ -82,6 +82,149 @@ class NumerrinMeshTestCase(unittest.TestCase):
 
         self.mesh.add_cells(self.cells)
 
+        # the same mesh as arrays
+        self.point_coordinates = [point.coordinates
+                                  for point in self.points]
+        self.face_nodes = [[puids.index(puid) for puid in face.points]
+                           for face in self.faces]
+
+    def _unit_cube_mesh(self, boundaries=None):
+        if boundaries is None:
+            boundaries = {'inlet': [0], 'outlet': [1]}
+        return NumerrinMesh.from_arrays('test_mesh', self.pool,
+                                        self.point_coordinates,
+                                        [range(8)],
+                                        boundaries=boundaries,
+                                        faces=self.face_nodes)
+
+    def test_from_arrays(self):
+        """Test from_arrays method
+
+        """
+
+        num_mesh = self._unit_cube_mesh()
+        self.assertEqual(num_mesh.count_of(CUBA.POINT), len(self.points))
+        self.assertEqual(num_mesh.count_of(CUBA.FACE), len(self.faces))
+        self.assertEqual(num_mesh.count_of(CUBA.CELL), 1)
+        self.assertEqual(set(num_mesh._boundaries.keys()),
+                         set(['inlet', 'outlet']))
+        face = num_mesh._get_face(num_mesh._boundaries['inlet'][0])
+        self.assertEqual(
+            [num_mesh._get_point(puid).coordinates for puid in face.points],
+            [self.mesh.get(puid).coordinates
+             for puid in self.faces[0].points])
+
+    def test_from_pool(self):
+        """Test from_pool method
+
+        """
+
+        self.pool.import_arrays('test_mesh', self.point_coordinates,
+                                [range(8)],
+                                boundaries={'inlet': [0], 'outlet': [1]},
+                                faces=self.face_nodes)
+        num_mesh = NumerrinMesh.from_pool('test_mesh', self.pool,
+                                          ['inlet', 'outlet'])
+        self.assertEqual(num_mesh.count_of(CUBA.POINT), len(self.points))
+        self.assertEqual(num_mesh.count_of(CUBA.CELL), 1)
+        face = num_mesh._get_face(num_mesh._boundaries['outlet'][0])
+        self.assertEqual(
+            [num_mesh._get_point(puid).coordinates for puid in face.points],
+            [self.mesh.get(puid).coordinates
+             for puid in self.faces[1].points])
+
+    def test_get_boundary_labels(self):
+        """Test get_boundary_labels method
+
+        """
+
+        num_mesh = self._unit_cube_mesh({'inlet': [0, 4]})
+        self.assertEqual(
+            num_mesh.get_boundary_labels('inlet').tolist(), [0, 4])
+        self.assertEqual(
+            num_mesh.get_boundary_labels('inlet', CUBA.POINT).tolist(),
+            [0, 1, 2, 3, 4, 7])
+        # only the boundary faces are read
+        self.assertEqual(num_mesh._connectivity, {})
+        self.assertEqual(
+            num_mesh.get_boundary_labels('inlet', CUBA.POINT).tolist(),
+            [0, 1, 2, 3, 4, 7])
+        with self.assertRaises(ValueError):
+            num_mesh.get_boundary_labels('outlet')
+
+    def test_iter_boundary_points(self):
+        """Test iter_boundary_points method
+
+        """
+
+        num_mesh = self._unit_cube_mesh()
+        self.assertEqual(
+            [point.coordinates
+             for point in num_mesh.iter_boundary_points('inlet')],
+            [self.point_coordinates[label] for label in (0, 3, 4, 7)])
+
+    def test_get_boundary_field(self):
+        """Test get_boundary_field method
+
+        """
+
+        num_mesh = self._unit_cube_mesh()
+        num_mesh.set_field(CUBA.PRESSURE, range(8))
+        self.assertEqual(
+            num_mesh.get_boundary_field('inlet', CUBA.PRESSURE).tolist(),
+            [0.0, 3.0, 4.0, 7.0])
+
+    def test_boundary_area(self):
+        """Test boundary_area method
+
+        """
+
+        num_mesh = self._unit_cube_mesh()
+        self.assertAlmostEqual(num_mesh.boundary_area('inlet'), 1.0)
+        # parsed code is reused and no loop variables are left in pool
+        self.assertAlmostEqual(num_mesh.boundary_area('inlet'), 1.0)
+        self.assertEqual(len(num_mesh._reduction_codes), 1)
+        self.assertFalse(self.pool.exists('i'))
+        with self.assertRaises(ValueError):
+            num_mesh.boundary_area('walls')
+
+    def test_boundary_flow_rate(self):
+        """Test boundary_flow_rate method
+
+        """
+
+        num_mesh = self._unit_cube_mesh()
+        num_mesh.set_field(CUBA.VELOCITY, (2.0, 0.0, 0.0))
+        self.assertAlmostEqual(num_mesh.boundary_flow_rate('inlet'), -2.0)
+        self.assertAlmostEqual(
+            num_mesh.boundary_flow_rate('outlet', density=3.0), 6.0)
+
+    def test_boundary_force(self):
+        """Test boundary_force method
+
+        """
+
+        num_mesh = self._unit_cube_mesh()
+        num_mesh.set_field(CUBA.PRESSURE, 4.0)
+        force = num_mesh.boundary_force('outlet')
+        self.assertAlmostEqual(force[0], 4.0)
+        self.assertAlmostEqual(force[1], 0.0)
+        self.assertAlmostEqual(force[2], 0.0)
+
+    def test_boundary_average(self):
+        """Test boundary_average method
+
+        """
+
+        num_mesh = self._unit_cube_mesh()
+        num_mesh.set_field(CUBA.PRESSURE, 4.0)
+        num_mesh.set_field(CUBA.VELOCITY, (1.0, 2.0, 0.0))
+        self.assertAlmostEqual(
+            num_mesh.boundary_average('inlet', CUBA.PRESSURE), 4.0)
+        velocity = num_mesh.boundary_average('inlet', CUBA.VELOCITY)
+        self.assertAlmostEqual(velocity[0], 1.0)
+        self.assertAlmostEqual(velocity[1], 2.0)
+
     def test_get_point(self):
         """Test get_point method
 
@@ -175,6 +318,150 @@ class NumerrinMeshTestCase(unittest.TestCase):
         self.assertIsInstance(point_f.data, DataContainer)
         self.assertEqual(points[0].data, point_f.data)
 
+    def test_update_points_subset(self):
+        """Test update_points method with a subset of points
+
+        """
+
+        num_mesh = NumerrinMesh('test_mesh', self.mesh, self.pool)
+        point = num_mesh.get(self.points[2].uid)
+        point.data[CUBA.PRESSURE] = 7.0
+        point.data[CUBA.VOLUME_FRACTION] = 0.5
+        num_mesh.update([point])
+        label = num_mesh._numPointLabelToUuid.label(point.uid)
+        pressure = [4.0] * len(self.points)
+        pressure[label] = 7.0
+        self.assertEqual(num_mesh.get_field(CUBA.PRESSURE).tolist(),
+                         pressure)
+        volume_fraction = [0.0] * len(self.points)
+        volume_fraction[label] = 0.5
+        self.assertEqual(num_mesh.get_field(CUBA.VOLUME_FRACTION).tolist(),
+                         volume_fraction)
+        with self.assertRaises(KeyError):
+            num_mesh.update([Point((0.0, 0.0, 0.0))])
+
+    def test_update_points_cached_field(self):
+        """Test that updating points keeps the field snapshot in sync
+
+        """
+
+        num_mesh = NumerrinMesh('test_mesh', self.mesh, self.pool)
+        point = num_mesh.get(self.points[1].uid)
+        point.data[CUBA.VELOCITY] = (5.0, 6.0, 7.0)
+        num_mesh.update([point])
+        self.assertIn(CUBA.VELOCITY, num_mesh._fields)
+        self.assertEqual(
+            num_mesh.get_field(CUBA.VELOCITY).tolist(),
+            [list(v) for v in
+             self.pool.get_real_function('test_meshVelocity')])
+        self.assertEqual(num_mesh.get(point.uid).data[CUBA.VELOCITY],
+                         (5.0, 6.0, 7.0))
+
+    def test_flush(self):
+        """Test flush method with buffered updates
+
+        """
+
+        num_mesh = NumerrinMesh('test_mesh', self.mesh, self.pool)
+        num_mesh.buffered = True
+        point = num_mesh.get(self.points[2].uid)
+        point.data[CUBA.PRESSURE] = 7.0
+        num_mesh.update([point])
+        point.data[CUBA.PRESSURE] = 8.0
+        num_mesh.update([point])
+        self.assertEqual(
+            set(self.pool.get_real_function('test_meshPressure')), {4.0})
+        num_mesh.flush()
+        self.assertEqual(
+            sorted(self.pool.get_real_function('test_meshPressure')),
+            [4.0] * (len(self.points) - 1) + [8.0])
+
+    def test_buffered_update_read(self):
+        """Test that reading a point writes buffered updates
+
+        """
+
+        num_mesh = NumerrinMesh('test_mesh', self.mesh, self.pool)
+        num_mesh.buffered = True
+        point = num_mesh.get(self.points[2].uid)
+        point.data[CUBA.VELOCITY] = (0.0, 2.0, 0.0)
+        num_mesh.update([point])
+        self.assertEqual(num_mesh.get(point.uid).data[CUBA.VELOCITY],
+                         (0.0, 2.0, 0.0))
+
+    def test_get_coordinates(self):
+        """Test get_coordinates method
+
+        """
+
+        num_mesh = NumerrinMesh('test_mesh', self.mesh, self.pool)
+        coordinates = num_mesh.get_coordinates()
+        self.assertEqual(coordinates.shape, (len(self.points), 3))
+        for point in self.points:
+            label = num_mesh._numPointLabelToUuid.label(point.uid)
+            self.assertEqual(tuple(coordinates[label]), point.coordinates)
+
+    def test_get_connectivity(self):
+        """Test get_connectivity method
+
+        """
+
+        num_mesh = NumerrinMesh('test_mesh', self.mesh, self.pool)
+        connectivity = num_mesh.get_connectivity(CUBA.CELL)
+        self.assertIs(connectivity, num_mesh.get_connectivity(CUBA.CELL))
+        self.assertEqual(
+            num_mesh._numPointLabelToUuid.uuids(connectivity[0]),
+            self.cells[0].points)
+        with self.assertRaises(ValueError):
+            connectivity[0, 0] = 1
+
+    def test_get_field(self):
+        """Test get_field method
+
+        """
+
+        num_mesh = NumerrinMesh('test_mesh', self.mesh, self.pool)
+        velocity = num_mesh.get_field(CUBA.VELOCITY)
+        self.assertEqual(velocity.shape, (len(self.points), 3))
+        self.assertEqual(velocity.tolist(),
+                         [[1.0, 0.0, 0.0]] * len(self.points))
+        pressure = num_mesh.get_field(CUBA.PRESSURE)
+        self.assertEqual(pressure.tolist(), [4.0] * len(self.points))
+        with self.assertRaises(ValueError):
+            num_mesh.get_field(CUBA.VOLUME_FRACTION)
+
+    def test_set_field(self):
+        """Test set_field method
+
+        """
+
+        num_mesh = NumerrinMesh('test_mesh', self.mesh, self.pool)
+        n = len(self.points)
+        velocity = [[float(i), 0.0, 1.0] for i in range(n)]
+        num_mesh.set_field(CUBA.VELOCITY, velocity)
+        self.assertEqual(num_mesh.get_field(CUBA.VELOCITY).tolist(),
+                         velocity)
+        num_mesh.set_field(CUBA.VOLUME_FRACTION, 0.5)
+        self.assertEqual(num_mesh.get_field(CUBA.VOLUME_FRACTION).tolist(),
+                         [0.5] * n)
+        point = num_mesh.get(self.points[1].uid)
+        label = num_mesh._numPointLabelToUuid.label(point.uid)
+        self.assertEqual(point.data[CUBA.VELOCITY], tuple(velocity[label]))
+        self.assertEqual(point.data[CUBA.VOLUME_FRACTION], 0.5)
+
+    def test_clear_field_cache(self):
+        """Test clear_field_cache method
+
+        """
+
+        num_mesh = NumerrinMesh('test_mesh', self.mesh, self.pool)
+        point = self.points[0]
+        self.assertEqual(num_mesh.get(point.uid).data[CUBA.PRESSURE], 4.0)
+        self.pool.modify_variable('test_meshPressure[[:]]',
+                                  tuple(5.0 for _ in self.points))
+        num_mesh.clear_field_cache()
+        self.assertEqual(num_mesh.get(point.uid).data[CUBA.PRESSURE], 5.0)
+
     def test_update_edges(self):
         """Test update_edges method
 
@@ -225,6 +512,38 @@ class NumerrinMeshTestCase(unittest.TestCase):
             self.assertEqual(point.data[CUBA.PRESSURE],
                              point_f.data[CUBA.PRESSURE])
 
+    def test_iter_chunks(self):
+        """Test iter_chunks method
+
+        """
+
+        num_mesh = NumerrinMesh('test_mesh', self.mesh, self.pool)
+        chunks = list(num_mesh.iter_chunks(CUBA.POINT, chunk_size=3,
+                                           fields=[CUBA.PRESSURE]))
+        self.assertEqual([len(chunk[0]) for chunk in chunks], [3, 3, 2])
+        for labels, uids, coordinates, fields in chunks:
+            for label, uid, coords, pressure in zip(labels, uids,
+                                                    coordinates,
+                                                    fields[CUBA.PRESSURE]):
+                point = self.mesh.get(uid)
+                self.assertEqual(tuple(coords), point.coordinates)
+                self.assertEqual(pressure, point.data[CUBA.PRESSURE])
+
+        face_uids = [self.faces[3].uid, self.faces[1].uid]
+        (labels, uids, connectivity, fields), =\
+            num_mesh.iter_chunks(CUBA.FACE, uuids=face_uids)
+        self.assertEqual(uids, face_uids)
+        self.assertEqual(fields, {})
+        self.assertEqual(
+            num_mesh._numPointLabelToUuid.uuids(connectivity[0]),
+            self.faces[3].points)
+
+        with self.assertRaises(ValueError):
+            list(num_mesh.iter_chunks(CUBA.CELL, fields=[CUBA.PRESSURE]))
+        with self.assertRaises(ValueError):
+            list(num_mesh.iter_chunks(CUBA.POINT,
+                                      uuids=[self.faces[0].uid]))
+
     def test_has_faces(self):
         """Test has_faces method
 
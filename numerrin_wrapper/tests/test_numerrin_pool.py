@@ -108,6 +108,117 @@ class NumerrinPoolTestCase(unittest.TestCase):
         self.assertEqual(numerrin.meshsize(pool.ph, self.mesh.name)[3],
                          len(self.cells))
 
+    def test_import_arrays(self):
+        """Test import_arrays method
+
+        """
+
+        pool = NumerrinPool()
+        points = [point.coordinates for point in self.points]
+        faces = [[self.puids.index(puid) for puid in face.points]
+                 for face in self.faces]
+        cells = [range(8)]
+        boundaries = dict(('boundary'+str(i), [i]) for i in range(6))
+        maps = pool.import_arrays(self.mesh.name, points, cells,
+                                  boundaries=boundaries, faces=faces)
+        self.assertEqual(numerrin.meshsize(pool.ph, self.mesh.name)[0],
+                         len(self.points))
+        self.assertEqual(numerrin.meshsize(pool.ph, self.mesh.name)[2],
+                         len(self.faces))
+        self.assertEqual(numerrin.meshsize(pool.ph, self.mesh.name)[3],
+                         len(self.cells))
+        self.assertEqual(len(maps[1]), len(self.points))
+        self.assertEqual(
+            tuple(numerrin.getelementnumbers(pool.ph,
+                                             self.mesh.name+'boundary2')),
+            (2,))
+
+    def test_import_arrays_boundaries_without_faces(self):
+        """Test import_arrays method with boundaries but no faces
+
+        """
+
+        pool = NumerrinPool()
+        points = [point.coordinates for point in self.points]
+        with self.assertRaises(ValueError):
+            pool.import_arrays(self.mesh.name, points, [range(8)],
+                               boundaries={'boundary0': [0]})
+
+    def test_adopt_mesh(self):
+        """Test adopt_mesh method
+
+        """
+
+        pool = NumerrinPool()
+        points = [point.coordinates for point in self.points]
+        faces = [[self.puids.index(puid) for puid in face.points]
+                 for face in self.faces]
+        pool.import_arrays(self.mesh.name, points, [range(8)],
+                           boundaries={'boundary2': [2]}, faces=faces)
+        maps, boundary_faces = pool.adopt_mesh(self.mesh.name,
+                                               ['boundary2'])
+        self.assertEqual(len(maps[1]), len(self.points))
+        self.assertEqual(len(maps[3]), len(self.faces))
+        self.assertEqual(boundary_faces, {'boundary2': [2]})
+
+        # edges and faces are created for a pool mesh without them
+        pool = NumerrinPool()
+        numerrin.initmesh(pool.ph, self.mesh.name, 3,
+                          (len(self.points), 0, 0, 1))
+        pool.set_nodes(self.mesh.name, points)
+        pool.set_elements(self.mesh.name, 3, [range(8)], [7])
+        maps, boundary_faces = pool.adopt_mesh(self.mesh.name, [])
+        self.assertEqual(pool.mesh_size(self.mesh.name), (8, 12, 6, 1))
+        self.assertEqual(len(maps[2]), 12)
+        self.assertEqual(len(maps[3]), 6)
+
+    def test_set_nodes(self):
+        """Test set_nodes method
+
+        """
+
+        pool = NumerrinPool()
+        numerrin.initmesh(pool.ph, self.mesh.name, 3,
+                          (len(self.points), 0, 0, 0))
+        coordinates = [point.coordinates for point in self.points]
+        pool.set_nodes(self.mesh.name, coordinates)
+        for label, coords in enumerate(coordinates):
+            self.assertEqual(
+                tuple(numerrin.getnode(pool.ph, self.mesh.name, label)),
+                coords)
+
+    def test_get_nodes(self):
+        """Test get_nodes method
+
+        """
+
+        pool = NumerrinPool()
+        numerrin.initmesh(pool.ph, self.mesh.name, 3,
+                          (len(self.points), 0, 0, 0))
+        coordinates = [point.coordinates for point in self.points]
+        pool.set_nodes(self.mesh.name, coordinates)
+        self.assertEqual(pool.get_nodes(self.mesh.name).tolist(),
+                         [list(coords) for coords in coordinates])
+
+    def test_set_elements(self):
+        """Test set_elements method
+
+        """
+
+        pool = NumerrinPool()
+        numerrin.initmesh(pool.ph, self.mesh.name, 3,
+                          (len(self.points), 0, 2, 0))
+        pool.set_nodes(self.mesh.name,
+                       [point.coordinates for point in self.points])
+        connectivity = [[0, 1, 3, 2], [4, 5, 6, -1]]
+        pool.set_elements(self.mesh.name, 2, connectivity)
+        self.assertEqual(
+            tuple(numerrin.getelement(pool.ph, self.mesh.name, 2, 0, 0)),
+            (0, 1, 3, 2))
+        self.assertEqual(
+            tuple(numerrin.getelement(pool.ph, self.mesh.name, 2, 1, 0)),
+            (4, 5, 6))
+
     def test_clear(self):
         """Test clear method
 
@@ -119,6 +230,106 @@ class NumerrinPoolTestCase(unittest.TestCase):
         with self.assertRaises(RuntimeError):
             numerrin.meshsize(pool.ph, self.mesh.name)
 
+    def test_invalidate_metadata(self):
+        """Test invalidate_metadata method
+
+        """
+
+        pool = NumerrinPool()
+        pool.put_variable(self.variablename, self.variable)
+        self.assertEqual(pool.variable_rank(self.variablename), 2)
+        pool.put_variable(self.variablename, (0.0, 1.0))
+        self.assertEqual(pool.variable_rank(self.variablename), 1)
+        numerrin.putvariable(pool.ph, self.variablename, 1.0)
+        self.assertEqual(pool.variable_rank(self.variablename), 1)
+        pool.invalidate_metadata()
+        self.assertEqual(pool.variable_rank(self.variablename), 0)
+
+        # only metadata of the written variable is cleared
+        pool.put_variable('b', 1.0)
+        numerrin.putvariable(pool.ph, self.variablename, (0.0, 1.0))
+        pool.put_variable('b', 2.0)
+        self.assertEqual(pool.variable_rank(self.variablename), 0)
+        pool.invalidate_metadata(self.variablename)
+        self.assertEqual(pool.variable_rank(self.variablename), 1)
+
+        # mesh sizes are kept until the mesh is deleted
+        pool.import_mesh(self.mesh.name, self.mesh, self.boundaries)
+        size = pool.mesh_size(self.mesh.name)
+        pool.invalidate_metadata()
+        self.assertIs(pool.mesh_size(self.mesh.name), size)
+        pool.delete_mesh_and_variables(self.mesh.name)
+        self.assertNotIn(self.mesh.name, pool._mesh_sizes)
+
+    def test_exists(self):
+        """Test exists method
+
+        """
+
+        pool = NumerrinPool()
+        pool.import_mesh(self.mesh.name, self.mesh, self.boundaries)
+        self.assertTrue(pool.exists(self.mesh.name))
+        self.assertTrue(pool.exists(self.mesh.name + 'boundary0'))
+        self.assertFalse(pool.exists(self.variablename))
+        numerrin.putvariable(pool.ph, self.variablename, self.variable)
+        self.assertTrue(pool.exists(self.variablename))
+        pool.delete_mesh_and_variables(self.mesh.name)
+        self.assertFalse(pool.exists(self.mesh.name))
+        self.assertFalse(pool.exists(self.variablename))
+
+    def test_field_stats(self):
+        """Test field_stats method
+
+        """
+
+        pool = NumerrinPool()
+        pool.import_mesh(self.mesh.name, self.mesh, self.boundaries)
+        pool.create_space('V', 'omega', 'Lagrange', 1)
+        pool.create_realfunction(self.variablename, 'V', 3)
+        n = len(self.points)
+        pool.modify_variable(self.variablename + '[0][[:]]',
+                             tuple(float(i) for i in range(n)))
+        pool.modify_variable(self.variablename + '[2][[:]]',
+                             (2.0,) * n)
+        stats = pool.field_stats(self.variablename)
+        self.assertEqual(stats['min'].tolist(), [0.0, 0.0, 2.0])
+        self.assertEqual(stats['max'].tolist(), [n - 1.0, 0.0, 2.0])
+        self.assertEqual(stats['mean'].tolist(), [(n - 1.0) / 2, 0.0, 2.0])
+        self.assertAlmostEqual(stats['l2'][2], (4.0 * n) ** 0.5)
+        with self.assertRaises(ValueError):
+            pool.field_stats('unknown')
+
+    def test_function_size(self):
+        """Test that function size is found for functions created
+        outside the pool
+
+        """
+
+        pool = NumerrinPool()
+        pool.import_mesh(self.mesh.name, self.mesh, self.boundaries)
+        pool.create_space('V', 'omega', 'Lagrange', 1)
+        numerrin.createrealfunction(pool.ph, 'u', 'V', 3)
+        numerrin.createrealfunction(pool.ph, 'p', 'V', 1)
+        self.assertEqual(pool._function_size('u'), 3)
+        self.assertEqual(pool._function_size('p'), 1)
+        with self.assertRaises(ValueError):
+            pool._function_size('unknown')
+
+    def test_delete_mesh_and_variables_stats(self):
+        """Test that cached function data is dropped with the mesh
+
+        """
+
+        pool = NumerrinPool()
+        pool.import_mesh(self.mesh.name, self.mesh, self.boundaries)
+        pool.create_space('V', 'omega', 'Lagrange', 1)
+        vname = self.mesh.name + 'Velocity'
+        pool.create_realfunction(vname, 'V', 3)
+        pool._stats_codes[vname] = (3, None)
+        pool.delete_mesh_and_variables(self.mesh.name)
+        self.assertNotIn(vname, pool._function_sizes)
+        self.assertNotIn(vname, pool._stats_codes)
+
     def test_variable_type(self):
         """Test variable_type method
 
@@ -146,6 +357,19 @@ class NumerrinPoolTestCase(unittest.TestCase):
         pool.put_variable(self.variablename, self.variable)
         self.assertEqual(pool.get_variable(self.variablename), self.variable)
 
+    def test_put_bc_values(self):
+        """Test put_bc_values method
+
+        """
+
+        pool = NumerrinPool()
+        pool.import_mesh(self.mesh.name, self.mesh, self.boundaries)
+        bc_name = self.mesh.name + 'inletVelocityBC'
+        pool.put_bc_values(self.mesh.name, {bc_name: (1.0, 0.0, 0.0)})
+        self.assertEqual(pool.get_variable(bc_name), (1.0, 0.0, 0.0))
+        pool.delete_mesh_and_variables(self.mesh.name)
+        self.assertFalse(pool.exists(bc_name))
+
     def test_put_variable(self):
         """Test put_variable method
 
@@ -206,6 +430,67 @@ class NumerrinPoolTestCase(unittest.TestCase):
                               for p in self.mesh.iter(item_type=CUBA.POINT)]))
         self.assertEqual(boundaries.keys(), boundary_names)
 
+    def test_iter_export(self):
+        """Test iter_export method
+
+        """
+
+        pool = NumerrinPool()
+        pool.import_mesh(self.mesh.name, self.mesh, self.boundaries)
+        chunks = list(pool.iter_export(self.mesh.name, chunk_size=3))
+        points = [point for item_type, items in chunks
+                  if item_type == CUBA.POINT for point in items]
+        faces = [face for item_type, items in chunks
+                 if item_type == CUBA.FACE for face in items]
+        self.assertTrue(all(len(items) <= 3 for _, items in chunks))
+        self.assertEqual([point.coordinates for point in points],
+                         [point.coordinates for point in self.points])
+        self.assertEqual(len(faces), len(self.faces))
+        point_uids = [point.uid for point in points]
+        self.assertEqual(faces[0].points,
+                         [point_uids[self.puids.index(puid)]
+                          for puid in self.faces[0].points])
+
+    def test_export_arrays(self):
+        """Test export_arrays method
+
+        """
+
+        pool = NumerrinPool()
+        points = [point.coordinates for point in self.points]
+        faces = [[self.puids.index(puid) for puid in face.points]
+                 for face in self.faces]
+        pool.import_arrays(self.mesh.name, points, [range(8)],
+                           boundaries={'boundary2': [2]}, faces=faces)
+        coordinates, connectivity, element_types, boundary_faces =\
+            pool.export_arrays(self.mesh.name, ['boundary2'])
+        self.assertEqual(coordinates.tolist(),
+                         [list(coords) for coords in points])
+        self.assertEqual(connectivity[1].tolist(), faces)
+        self.assertEqual(connectivity[2].tolist(), [list(range(8))])
+        self.assertEqual(element_types[1].tolist(), [3] * len(faces))
+        self.assertEqual(element_types[2].tolist(), [7])
+        self.assertEqual(boundary_faces['boundary2'].tolist(), [2])
+
+    def test_export_arrays_surface_mesh(self):
+        """Test export_arrays method with a mesh without cells
+
+        """
+
+        pool = NumerrinPool()
+        numerrin.initmesh(pool.ph, 'surface', 2, (4, 0, 1))
+        for label, coords in enumerate([(0.0, 0.0, 0.0), (1.0, 0.0, 0.0),
+                                        (1.0, 1.0, 0.0), (0.0, 1.0, 0.0)]):
+            numerrin.setnode(pool.ph, 'surface', label, coords)
+        numerrin.setelementtype(pool.ph, 'surface', 2, 0, 3)
+        numerrin.setelement(pool.ph, 'surface', 2, 0, 0, (0, 1, 3, 2))
+        coordinates, connectivity, element_types, boundary_faces =\
+            pool.export_arrays('surface')
+        self.assertEqual(len(coordinates), 4)
+        self.assertEqual(len(connectivity[1]), 1)
+        self.assertEqual(len(connectivity[2]), 0)
+        self.assertEqual(len(element_types[2]), 0)
+
 
 if __name__ == '__main__':
     unittest.main()
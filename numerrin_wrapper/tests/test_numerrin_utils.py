@@ -0,0 +1,124 @@
+""" test_numerrin_utils module
+
+This module contains the unitary tests for the
+numerrin_utils module functionalities
+
+"""
+
+import unittest
+import uuid
+
+import numpy
+
+from numerrin_wrapper.numerrin_utils import (face_renode, cell_renode,
+                                             renode_connectivity,
+                                             derived_uuid, derived_label,
+                                             UuidArrayMap, DerivedUuidMap,
+                                             UuidIndex)
+
+
+class NumerrinUtilsTestCase(unittest.TestCase):
+    """Test case for numerrin_utils functions"""
+
+    def test_renode_connectivity(self):
+        """Test renode_connectivity function
+
+        """
+
+        connectivity = numpy.array([[0, 1, 2, 3, 4, 5, 6, 7],
+                                    [0, 1, 2, 3, -1, -1, -1, -1],
+                                    [0, 1, 2, 3, 4, 5, -1, -1]])
+        renoded = renode_connectivity(connectivity, [7, 4, 6])
+        self.assertEqual(renoded.tolist(),
+                         [cell_renode(list(range(8))),
+                          [0, 1, 2, 3, -1, -1, -1, -1],
+                          [0, 1, 2, 3, 4, 5, -1, -1]])
+        self.assertEqual(connectivity[0].tolist(), list(range(8)))
+
+        faces = numpy.array([[0, 1, 2, 3], [0, 1, 2, -1]])
+        renoded = renode_connectivity(faces, [3, 2])
+        self.assertEqual(renoded.tolist(),
+                         [face_renode([0, 1, 2, 3]), [0, 1, 2, -1]])
+
+        # elements of default types are renoded only if they have as
+        # many nodes as the permutation
+        faces = numpy.array([[0, 1, 2, 3, 4], [0, 1, 2, 3, -1]])
+        renoded = renode_connectivity(faces, [3, 3])
+        self.assertEqual(renoded.tolist(),
+                         [face_renode([0, 1, 2, 3, 4]),
+                          face_renode([0, 1, 2, 3]) + [-1]])
+        cells = numpy.array([[0, 1, 2, 3, 4, -1, -1],
+                             [0, 1, 2, 3, 4, 5, 6]])
+        renoded = renode_connectivity(cells, [7, 7])
+        self.assertEqual(renoded.tolist(), cells.tolist())
+
+    def test_renode_connectivity_is_involution(self):
+        """Test that renoding twice restores the node order
+
+        """
+
+        connectivity = numpy.arange(16).reshape(2, 8)
+        types = [7, 7]
+        renoded = renode_connectivity(renode_connectivity(connectivity,
+                                                          types), types)
+        self.assertEqual(renoded.tolist(), connectivity.tolist())
+
+    def test_derived_uuid(self):
+        """Test derived_uuid and derived_label functions
+
+        """
+
+        namespace = uuid.uuid4()
+        uid = derived_uuid(namespace, 2, 12345)
+        self.assertEqual(uid, derived_uuid(namespace, 2, 12345))
+        self.assertNotEqual(uid, derived_uuid(namespace, 2, 12346))
+        self.assertNotEqual(uid, derived_uuid(namespace, 1, 12345))
+        self.assertEqual(derived_label(namespace, 2, uid), 12345)
+        self.assertIsNone(derived_label(namespace, 1, uid))
+        self.assertIsNone(derived_label(uuid.uuid4(), 2, uid))
+        self.assertIsNone(derived_label(namespace, 2, uuid.uuid4()))
+
+    def test_uuid_array_map(self):
+        """Test UuidArrayMap lookups
+
+        """
+
+        uids = [uuid.uuid4() for _ in range(4)]
+        uuid_map = UuidArrayMap(uids)
+        self.assertEqual(len(uuid_map), 4)
+        self.assertEqual(uuid_map[2], uids[2])
+        self.assertEqual(uuid_map.uuids([3, 0]), [uids[3], uids[0]])
+        self.assertEqual(uuid_map.label(uids[1]), 1)
+        self.assertEqual(uuid_map.labels([uids[3], uids[1]]).tolist(),
+                         [3, 1])
+        self.assertTrue(uuid_map.has_uuid(uids[0]))
+        self.assertFalse(uuid_map.has_uuid(uuid.uuid4()))
+        with self.assertRaises(KeyError):
+            uuid_map.label(uuid.uuid4())
+        with self.assertRaises(KeyError):
+            uuid_map.labels([uids[0], uuid.uuid4()])
+
+    def test_uuid_index(self):
+        """Test UuidIndex with array and derived uuid maps
+
+        """
+
+        namespace = uuid.uuid4()
+        point_uid = uuid.uuid4()
+        edge_map = DerivedUuidMap(namespace, 1, 3)
+        index = UuidIndex([UuidArrayMap([point_uid]), edge_map])
+        self.assertEqual(len(edge_map), 3)
+        self.assertEqual(index[point_uid], 0)
+        self.assertEqual(index[edge_map[2]], 2)
+        self.assertIn(edge_map[1], index)
+        self.assertNotIn(derived_uuid(namespace, 1, 3), index)
+        self.assertEqual(edge_map.labels([edge_map[2], edge_map[0]]).tolist(),
+                         [2, 0])
+        with self.assertRaises(KeyError):
+            edge_map[3]
+        with self.assertRaises(KeyError):
+            index[uuid.uuid4()]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -70,6 +70,39 @@ class WrapperTestCase(unittest.TestCase):
         wrapper.add_dataset(self.mesh)
         self.assertEqual(sum(1 for _ in wrapper.iter_datasets()), 1)
 
+    def test_add_dataset_from_arrays(self):
+        """Test add_dataset_from_arrays method
+
+        """
+
+        wrapper = Wrapper()
+        points = [point.coordinates for point in self.points]
+        faces = [[self.puids.index(puid) for puid in face.points]
+                 for face in self.faces]
+        wrapper.add_dataset_from_arrays('mesh2', points, [range(8)],
+                                        boundaries={'walls': range(6)},
+                                        faces=faces)
+        mesh_inside_wrapper = wrapper.get_dataset('mesh2')
+        self.assertEqual(mesh_inside_wrapper.count_of(CUBA.POINT),
+                         len(self.points))
+        with self.assertRaises(ValueError):
+            wrapper.add_dataset_from_arrays('mesh2', points, [range(8)])
+
+    def test_add_dataset_from_pool(self):
+        """Test add_dataset_from_pool method
+
+        """
+
+        wrapper = Wrapper()
+        points = [point.coordinates for point in self.points]
+        wrapper.pool.import_arrays('mesh2', points, [range(8)])
+        wrapper.add_dataset_from_pool('mesh2', [])
+        mesh_inside_wrapper = wrapper.get_dataset('mesh2')
+        self.assertEqual(mesh_inside_wrapper.count_of(CUBA.POINT),
+                         len(self.points))
+        with self.assertRaises(ValueError):
+            wrapper.add_dataset_from_pool('mesh2', [])
+
     def test_remove_dataset(self):
         """Test remove_dataset method
 
@@ -194,6 +227,60 @@ class WrapperTestCase(unittest.TestCase):
         self.assertNotAlmostEqual(old_vel, new_vel, 5)
         self.assertNotAlmostEqual(old_pres, new_pres, 5)
 
+    def test_advance(self):
+        """Test that advance continues the solution and copies it
+        to point data only when requested
+
+        """
+
+        wrapper = Wrapper()
+        name = 'simplemesh'
+        corner_points = ((0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0))
+        create_quad_mesh(name, wrapper, corner_points, 1, 3, 3, 1)
+
+        wrapper.CM[CUBA.NAME] = name
+        wrapper.CM_extensions[CUBAExt.GE] = (CUBAExt.INCOMPRESSIBLE,
+                                             CUBAExt.LAMINAR_MODEL)
+        wrapper.SP[CUBA.TIME_STEP] = 1
+        wrapper.SP[CUBA.NUMBER_OF_TIME_STEPS] = 1
+        wrapper.SP[CUBA.DENSITY] = 1.0
+        wrapper.SP[CUBA.DYNAMIC_VISCOSITY] = 1.0
+        wrapper.BC[CUBA.VELOCITY] = {'inflow': ('fixedValue', (0.1, 0, 0)),
+                                     'outflow': 'zeroGradient',
+                                     'walls': ('fixedValue', (0, 0, 0)),
+                                     'frontAndBack': 'empty'}
+        wrapper.BC[CUBA.PRESSURE] = {'inflow': 'zeroGradient',
+                                     'outflow': ('fixedValue', 0),
+                                     'walls': 'zeroGradient',
+                                     'frontAndBack': 'empty'}
+
+        mesh_inside_wrapper = wrapper.get_dataset(name)
+
+        wrapper.advance(1, copy_back=True)
+        self.assertEqual(mesh_inside_wrapper._time, 1.0)
+        old_vel = mesh_inside_wrapper.get_field(CUBA.VELOCITY)
+
+        wrapper.advance(2)
+        self.assertEqual(mesh_inside_wrapper._time, 3.0)
+        self.assertEqual(
+            mesh_inside_wrapper.get_field(CUBA.VELOCITY).tolist(),
+            old_vel.tolist())
+
+        wrapper.copy_back()
+        self.assertNotEqual(
+            mesh_inside_wrapper.get_field(CUBA.VELOCITY).tolist(),
+            old_vel.tolist())
+
+        # buffered updates do not overwrite the copied solution later
+        new_vel = mesh_inside_wrapper.get_field(CUBA.VELOCITY)
+        mesh_inside_wrapper.buffered = True
+        mesh_inside_wrapper.set_field(CUBA.VELOCITY, (0.0, 0.0, 0.0))
+        wrapper.copy_back()
+        mesh_inside_wrapper.flush()
+        self.assertEqual(
+            mesh_inside_wrapper.get_field(CUBA.VELOCITY).tolist(),
+            new_vel.tolist())
+
 
 if __name__ == '__main__':
     unittest.main()